@@ -4,6 +4,13 @@ import json
 from datetime import datetime
 import pandas as pd
 
+from planner.journal import Journal, delete_op, insert_op, set_op
+from planner.models import MockTest, validate_mock_test
+from planner.progress import (check_transition, ensure_state, record_event, remove_event, state_slice,
+                              subject_completion)
+from planner.quotes import QUOTES_FILE, QuoteIndex
+from planner.search import SearchIndex, progress_documents
+
 # File to store JEE and IAT-related data
 data_file = "jee_iat_data.json"
 
@@ -25,93 +32,109 @@ def save_data(data):
     with open(data_file, 'w') as f:
         json.dump(data, f, indent=4)
 
+def load_data_with_state():
+    data = load_data()
+    ensure_state(data)
+    return data
+
+# Every change goes through the journal so it can be undone (shared across reruns)
+@st.cache_resource
+def get_journal():
+    return Journal("ai_scheduler", {"data": (data_file, load_data_with_state, save_data)})
+
+def progress_state_ops(scratch, touched):
+    """
+    Journal operations that write the progress state keys a progress.py change touched
+    on its scratch state slice.
+    """
+    live = get_journal().state["data"]["progress_state"]
+    ops = []
+    for section, keys in touched.items():
+        for key in keys:
+            if key in scratch[section]:
+                ops.append(set_op(["data", "progress_state", section], key, scratch[section][key]))
+            elif key in live[section]:
+                ops.append(delete_op(["data", "progress_state", section], key))
+    return ops
+
 # Functions for Study Progress
-def add_study_progress(topic, status):
+def add_study_progress(topic, status, subject="General"):
     status = status.strip().lower()
     if not status or status not in ["completed", "in-progress", "not-started"]:
         return "❌ Invalid status. Please choose from: 'completed', 'in-progress', 'not-started'."
     
-    data = load_data()
+    data = get_journal().state["data"]
+    error = check_transition(data, topic, status)
+    if error:
+        return error
     progress = {
         "topic": topic,
+        "subject": subject,
         "status": status,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    data["study_progress"].append(progress)
-    save_data(data)
+    # Only the topic's entry and its subject counters change: work on a slice of the state
+    scratch = {"study_progress": [], "progress_state": state_slice(data, topic, [progress])}
+    touched = record_event(scratch, progress)
+    ops = [insert_op(["data", "study_progress"], progress)] + progress_state_ops(scratch["progress_state"], touched)
+    get_journal().batch(ops, label=f"{topic} {status}")
     return "✅ Study progress updated successfully."
 
 def delete_study_progress(index):
-    data = load_data()
+    data = get_journal().state["data"]
     if 0 <= index < len(data["study_progress"]):
-        removed = data["study_progress"].pop(index)
-        save_data(data)
+        topic = data["study_progress"][index]["topic"]
+        scratch = {"study_progress": list(data["study_progress"]),
+                   "progress_state": state_slice(data, topic, data["study_progress"])}
+        removed, touched = remove_event(scratch, index)
+        ops = [delete_op(["data", "study_progress"], index)] + progress_state_ops(scratch["progress_state"], touched)
+        get_journal().batch(ops, label=f"delete progress for {removed['topic']}")
         return f"🗑️ Deleted study progress for topic: {removed['topic']}"
     return "⚠️ Invalid index."
 
 # Functions for JEE Mock Test
 def add_jee_mock_test_result(score, accuracy, date, time_taken):
     # Ensure that inputs are within valid ranges
-    if not (0 <= score <= 300):  # Assuming max score is 300 for JEE Mains
-        return "❌ Score must be between 0 and 300."
-    if not (0 <= accuracy <= 100):
-        return "❌ Accuracy must be between 0 and 100."
+    error = validate_mock_test("jee", score, accuracy)
+    if error:
+        return error
     
-    data = load_data()
-    mock_test = {
-        "score": score,
-        "accuracy": accuracy,
-        "date": date.strftime('%Y-%m-%d'),
-        "time_taken": time_taken
-    }
-    data["jee_mock_tests"].append(mock_test)
-    save_data(data)
+    mock_test = MockTest(score, accuracy, date, time_taken, "jee")
+    get_journal().insert(["data", "jee_mock_tests"], mock_test.to_dict(), label="add JEE mock test")
     return "✅ JEE Mock Test result added successfully."
 
 def delete_jee_mock_test(index):
-    data = load_data()
+    data = get_journal().state["data"]
     if 0 <= index < len(data["jee_mock_tests"]):
-        removed = data["jee_mock_tests"].pop(index)
-        save_data(data)
+        removed = get_journal().delete(["data", "jee_mock_tests"], index, label="delete JEE mock test")
         return f"🗑️ Deleted JEE Mock Test result: {removed['score']} on {removed['date']}"
     return "⚠️ Invalid index."
 
 # Functions for IAT Mock Test
 def add_iat_mock_test_result(score, accuracy, date, time_taken):
     # Ensure that inputs are within valid ranges
-    if not (0 <= score <= 240):  # Assuming max score is 240 for IAT
-        return "❌ Score must be between 0 and 240."
-    if not (0 <= accuracy <= 100):
-        return "❌ Accuracy must be between 0 and 100."
+    error = validate_mock_test("iat", score, accuracy)
+    if error:
+        return error
     
-    data = load_data()
-    mock_test = {
-        "score": score,
-        "accuracy": accuracy,
-        "date": date.strftime('%Y-%m-%d'),
-        "time_taken": time_taken
-    }
-    data["iat_mock_tests"].append(mock_test)
-    save_data(data)
+    mock_test = MockTest(score, accuracy, date, time_taken, "iat")
+    get_journal().insert(["data", "iat_mock_tests"], mock_test.to_dict(), label="add IAT mock test")
     return "✅ IAT Mock Test result added successfully."
 
 def delete_iat_mock_test(index):
-    data = load_data()
+    data = get_journal().state["data"]
     if 0 <= index < len(data["iat_mock_tests"]):
-        removed = data["iat_mock_tests"].pop(index)
-        save_data(data)
+        removed = get_journal().delete(["data", "iat_mock_tests"], index, label="delete IAT mock test")
         return f"🗑️ Deleted IAT Mock Test result: {removed['score']} on {removed['date']}"
     return "⚠️ Invalid index."
 
 # Function for JEE Performance
 def add_jee_performance(score, accuracy, time_taken, attempted, correct, incorrect, unattempted):
     # Ensure that inputs are within valid ranges
-    if not (0 <= score <= 300):
-        return "❌ Score must be between 0 and 300."
-    if not (0 <= accuracy <= 100):
-        return "❌ Accuracy must be between 0 and 100."
+    error = validate_mock_test("jee", score, accuracy)
+    if error:
+        return error
     
-    data = load_data()
     jee_performance = {
         "score": score,
         "accuracy": accuracy,
@@ -121,13 +144,12 @@ def add_jee_performance(score, accuracy, time_taken, attempted, correct, incorre
         "incorrect": incorrect,
         "unattempted": unattempted
     }
-    data["jee_performance"].append(jee_performance)
-    save_data(data)
+    get_journal().insert(["data", "jee_performance"], jee_performance, label="add JEE performance")
     return "✅ JEE performance data added successfully."
 
 # Function for JEE Performance Analysis
 def get_jee_performance_analysis():
-    data = load_data()
+    data = get_journal().state["data"]
     if not data["jee_performance"]:
         return "No JEE performance data available."
     
@@ -155,22 +177,61 @@ st.title("📚 JEE & IAT Preparation Tracker")
 st.markdown("Track your JEE Mains, Advanced, and IAT progress, mock test results, and performance.")
 
 init_data()
-data = load_data()
+journal = get_journal()
+journal.refresh()
+data = journal.state["data"]
 
 # Sidebar for navigation
 page = st.sidebar.selectbox("Navigate", ["Add Study Progress", "View Study Progress", "Add JEE Mock Test Result", "View JEE Mock Test Results", "Add IAT Mock Test Result", "View IAT Mock Test Results"])
 
+# Quote of the day (the index is opened once and shared across reruns)
+@st.cache_resource
+def get_quote_index():
+    return QuoteIndex(QUOTES_FILE)
+
+quote = get_quote_index().quote_of_the_day()
+if quote:
+    st.sidebar.info(f"💡 \"{quote['quote']}\" - {quote['author']}")
+
+# Undo / redo the last changes
+undo_col, redo_col = st.sidebar.columns(2)
+if undo_col.button("↩️ Undo", disabled=not journal.can_undo()):
+    st.toast(f"Undid: {journal.undo()}")
+    st.rerun()
+if redo_col.button("↪️ Redo", disabled=not journal.can_redo()):
+    st.toast(f"Redid: {journal.redo()}")
+    st.rerun()
+
+# Search study progress topics (the index only re-indexes what changed)
+@st.cache_resource
+def get_search_index():
+    return SearchIndex()
+
+query = st.sidebar.text_input("🔍 Search progress")
+if query:
+    search_index = get_search_index()
+    search_index.sync("progress", progress_documents(data["study_progress"]), journal.version("data"))
+    results = search_index.search(query)
+    for result in results:
+        st.sidebar.write(f"**{result['kind']}** {result['date']}: {result['text']}")
+    if not results:
+        st.sidebar.caption("No matches.")
+
 # Add Study Progress
 if page == "Add Study Progress":
     st.header("➕ Add Study Progress")
     topic = st.text_input("Topic Name")
+    subject = st.selectbox("Subject", ["Physics", "Chemistry", "Maths", "Biology", "General"])
     status = st.radio("Status", ["completed", "in-progress", "not-started"], horizontal=True)
     if st.button("Add Progress"):
         if not topic:
             st.error("❌ Please enter a topic name.")
         else:
-            result = add_study_progress(topic, status)
-            st.success(result)
+            result = add_study_progress(topic, status, subject)
+            if result.startswith("✅"):
+                st.success(result)
+            else:
+                st.error(result)
 
 # View Study Progress
 elif page == "View Study Progress":
@@ -178,13 +239,26 @@ elif page == "View Study Progress":
     if not data["study_progress"]:
         st.info("No study progress yet. Add some from the 'Add Study Progress' page.")
     else:
-        for i, progress in enumerate(reversed(data["study_progress"])):
-            index = len(data["study_progress"]) - 1 - i
-            with st.expander(f"🕒 {progress['timestamp']} - {progress['topic']} ({progress['status']})"):
-                if st.button("Delete", key=f"delete_progress_{index}"):
-                    result = delete_study_progress(index)
-                    st.success(result)
-                    st.experimental_rerun()
+        # Current status per topic, read from the materialized state
+        state = ensure_state(data)
+        st.subheader("Completion by Subject")
+        for subject, percent in subject_completion(data).items():
+            st.write(f"**{subject}**: {percent}%")
+            st.progress(percent / 100)
+
+        st.subheader("Topics")
+        for topic, entry in sorted(state["topics"].items(), key=lambda item: item[1]["updated"], reverse=True):
+            spent = f" | ⏱️ {entry['hours_spent']} h" if entry["hours_spent"] else ""
+            st.write(f"**{topic}** ({entry['subject']}) - {entry['status']} | 🕒 {entry['updated']}{spent}")
+
+        if st.checkbox("Show full history"):
+            for i, progress in enumerate(reversed(data["study_progress"])):
+                index = len(data["study_progress"]) - 1 - i
+                with st.expander(f"🕒 {progress['timestamp']} - {progress['topic']} ({progress['status']})"):
+                    if st.button("Delete", key=f"delete_progress_{index}"):
+                        result = delete_study_progress(index)
+                        st.success(result)
+                        st.experimental_rerun()
 
 # Add JEE Mock Test Result
 elif page == "Add JEE Mock Test Result":
@@ -0,0 +1,23 @@
+import streamlit as st
+
+from app_pages.shared import get_study_data
+
+data = get_study_data()
+data.refresh("marks")
+
+st.header("AI-Based Topic Suggestions")
+marks_df = data.marks_frame()
+if marks_df.empty:
+    st.info("Please log some test scores to get suggestions.")
+else:
+    marks_df["Percentage"] = (marks_df["Score"] / marks_df["Total"]) * 100
+    subject_avg = marks_df.groupby("Subject")["Percentage"].mean().sort_values()
+    st.subheader("Subject-wise Performance")
+    st.bar_chart(subject_avg)
+
+    weak = subject_avg[subject_avg < 60].index.tolist()
+    strong = subject_avg[subject_avg >= 85].index.tolist()
+
+    st.markdown("### Suggestions:")
+    st.error(f"Focus on: {', '.join(weak)}") if weak else st.success("No weak subjects detected!")
+    st.info(f"Strong in: {', '.join(strong)}") if strong else st.warning("No strong subjects yet.")
@@ -0,0 +1,38 @@
+import os
+
+import streamlit as st
+
+from app_pages.shared import get_study_data
+from planner.calendar_export import export_feeds, merge_days, plan_days, task_days
+
+data = get_study_data()
+data.refresh("schedule", "study_plan")
+
+st.header("Study Schedule")
+with st.form("Add Task"):
+    d = st.date_input("Date")
+    task = st.text_input("Task")
+    if st.form_submit_button("Add Task"):
+        data.add_schedule_task(d, task)
+        st.success("Task added!")
+
+st.subheader("Upcoming Tasks")
+for idx, item in enumerate(data.schedule):
+    col1, col2 = st.columns([6, 1])
+    col1.write(f"**{item['date']}**: {item['task']}")
+    if col2.button("❌", key=f"remove_schedule_{idx}"):
+        data.remove_schedule_task(idx)
+        st.rerun()
+
+st.subheader("📅 Calendar Export")
+feed_name = st.text_input("Calendar name", value="student")
+if st.button("Export Calendar"):
+    # Only days that changed since the last export are regenerated
+    result = export_feeds(feed_name, merge_days(task_days(data.schedule), plan_days(data.study_plan)))
+    st.success(f"Calendar updated: {result['changed']} day(s) changed, {result['removed']} removed.")
+    if result["skipped"]:
+        st.warning(f"Skipped entries with invalid dates (use YYYY-MM-DD): {', '.join(result['skipped'])}")
+    with open(result["ics"], "rb") as f:
+        st.download_button("Download .ics", f.read(), file_name=os.path.basename(result["ics"]))
+    with open(result["csv"], "rb") as f:
+        st.download_button("Download .csv", f.read(), file_name=os.path.basename(result["csv"]))
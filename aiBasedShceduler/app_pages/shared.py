@@ -0,0 +1,11 @@
+# app_pages/shared.py
+
+import streamlit as st
+
+from planner.services import StudyData
+
+
+# One service instance per server process, shared across reruns and pages
+@st.cache_resource
+def get_study_data():
+    return StudyData()
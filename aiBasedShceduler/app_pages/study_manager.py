@@ -0,0 +1,61 @@
+import streamlit as st
+
+from app_pages.shared import get_study_data
+from planner.jobs import get_job, submit_plan_job
+
+data = get_study_data()
+data.refresh("study_plan", "todo")
+
+st.header("Daily Study Plan Manager")
+selected_date = str(st.date_input("Select Date for Planning"))
+
+with st.form("Add Plan"):
+    subject = st.selectbox("Subject", ["Physics", "Chemistry", "Maths", "Biology", "English", "CS"])
+    topic = st.text_input("Topic/Chapter").strip()
+    duration = st.number_input("Duration (in hours)", min_value=0.0, step=0.5)
+    if st.form_submit_button("Add to Plan"):
+        try:
+            data.add_plan_entry(selected_date, subject, topic, duration)
+        except ValueError as e:
+            st.error(f"Could not add the plan entry: {e}")
+        else:
+            st.success("Study plan added and synced with To-Do list!")
+
+st.subheader("🤖 Generate Plan with AI")
+with st.form("Generate Plan"):
+    ai_subject = st.selectbox("Subject", ["Physics", "Chemistry", "Maths", "Biology", "English", "CS"], key="ai_subject")
+    ai_topics = st.text_input("Topics (comma separated)")
+    hours_per_day = st.number_input("Study hours per day", min_value=0.5, value=3.0, step=0.5)
+    deadline_days = st.number_input("Days until deadline", min_value=1, value=14)
+    if st.form_submit_button("Generate in Background"):
+        topics = [t.strip() for t in ai_topics.split(",") if t.strip()]
+        if not topics:
+            st.error("Please enter at least one topic.")
+        else:
+            job_id = submit_plan_job(ai_subject, topics, hours_per_day, int(deadline_days), selected_date)
+            plan_jobs = st.session_state.setdefault("plan_jobs", [])
+            if job_id not in plan_jobs:
+                plan_jobs.append(job_id)
+            st.info("Plan generation started. You can keep using the app.")
+
+for job_id in st.session_state.get("plan_jobs", []):
+    job = get_job(job_id)
+    if not job:
+        continue
+    label = f"{job['params']['subject']}: {', '.join(job['params']['topics'])}"
+    if job["status"] == "running":
+        st.info(f"⏳ {label} - generating...")
+    elif job["status"] == "failed":
+        st.error(f"❌ {label} - {job['error']}")
+    else:
+        st.success(f"✅ {label} - added to your study plan and To-Do list")
+if st.session_state.get("plan_jobs") and st.button("🔄 Refresh"):
+    st.rerun()
+
+st.subheader(f"Plan for {selected_date}")
+for idx, entry in enumerate(data.study_plan.get(selected_date, [])):
+    col1, col2 = st.columns([6, 1])
+    col1.write(f"**{entry['subject']}** - {entry['topic']} ({entry['duration']} hrs)")
+    if col2.button("❌", key=f"remove_{idx}"):
+        data.remove_plan_entry(selected_date, idx)
+        st.rerun()
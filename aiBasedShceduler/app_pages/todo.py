@@ -0,0 +1,25 @@
+import streamlit as st
+
+from app_pages.shared import get_study_data
+
+data = get_study_data()
+data.refresh("todo")
+
+st.header("To-Do Tracker")
+
+with st.form("Add To-Do"):
+    task = st.text_input("Task").strip()
+    if st.form_submit_button("Add"):
+        if task:
+            data.add_todo(task)
+            st.success("Task added!")
+        else:
+            st.error("Please enter a task.")
+
+st.subheader("Your Tasks")
+for i, item in enumerate(data.todo_list):
+    col1, col2, col3 = st.columns([5, 1, 1])
+    col1.checkbox(label=item["task"], value=item["done"], key=i, on_change=data.toggle_todo, args=(i,))
+    if col2.button("🗑️", key=f"remove_todo_{i}"):
+        data.remove_todo(i)
+        st.rerun()
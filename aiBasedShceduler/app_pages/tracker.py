@@ -0,0 +1,67 @@
+import pandas as pd
+import streamlit as st
+
+from app_pages.shared import get_study_data
+
+data = get_study_data()
+data.refresh("marks")
+
+st.header("Test Performance Tracker")
+
+with st.form("Add Score"):
+    test_date = st.date_input("Test Date")
+    subject = st.selectbox("Subject", ["Physics", "Chemistry", "Maths", "Biology"])
+    test_type = st.selectbox("Test Type", ["Mock Test", "Unit Test", "Board Practice", "Others"])
+    score = st.number_input("Score Obtained", min_value=0)
+    total = st.number_input("Total Marks", min_value=1)
+    notes = st.text_area("Notes (optional)")
+    submitted = st.form_submit_button("Log Score")
+    if submitted:
+        data.log_score(test_date, subject, test_type, score, total, notes)
+        st.success("Score logged!")
+
+marks_df = data.marks_frame()
+
+st.subheader("Test Scores")
+if not marks_df.empty:
+    marks_df["Date"] = pd.to_datetime(marks_df["Date"])
+    unique_dates = sorted(marks_df["Date"].dt.strftime('%Y-%m-%d').unique())
+    selected_date = st.selectbox("Filter by Test Date", ["All"] + unique_dates)
+
+    # Ensure Test Type is a string before sorting
+    selected_type = st.selectbox("Filter by Test Type", ["All"] + sorted(marks_df["Test Type"].astype(str).unique()))
+
+    filtered_df = marks_df.copy()
+    if selected_date != "All":
+        filtered_df = filtered_df[filtered_df["Date"].dt.strftime('%Y-%m-%d') == selected_date]
+    if selected_type != "All":
+        filtered_df = filtered_df[filtered_df["Test Type"] == selected_type]
+
+    st.dataframe(filtered_df[["Date", "Subject", "Test Type", "Score", "Total", "Notes"]])
+
+    filtered_df["Score %"] = (filtered_df["Score"] / filtered_df["Total"]) * 100
+    score_chart = filtered_df.groupby(["Date", "Subject"])["Score %"].mean().unstack()
+    st.line_chart(score_chart)
+
+    st.subheader("📊 Performance Breakdown")
+    acc_chart = filtered_df.groupby("Subject")["Score %"].mean().sort_values()
+    st.bar_chart(acc_chart)
+
+    st.markdown("**Overall Stats:**")
+    total_tests = len(filtered_df)
+    avg_accuracy = round(filtered_df["Score %"].mean(), 2)
+    best_score = filtered_df["Score"].max()
+    worst_score = filtered_df["Score"].min()
+
+    st.info(f"Total Tests: {total_tests}")
+    st.success(f"Average Score: {avg_accuracy}%")
+    st.info(f"Best Score: {best_score}")
+    st.warning(f"Lowest Score: {worst_score}")
+
+    # Remove Test Entry (the frame keeps the row positions of the marks list as its index)
+    for idx, row in filtered_df.iterrows():
+        col1, col2 = st.columns([6, 1])
+        col1.write(f"**{row['Date']}**: {row['Subject']} - {row['Score']}/{row['Total']}")
+        if col2.button(f"❌ Remove Test {idx}", key=f"remove_test_{idx}"):
+            data.remove_score(int(idx))
+            st.rerun()
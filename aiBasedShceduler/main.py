@@ -6,6 +6,9 @@ from tkinter import messagebox, ttk
 import os
 from datetime import datetime
 
+from planner.models import Task
+from planner.search import SearchIndex, task_documents
+
 # ---------- File Paths ----------
 TODO_FILE = "to_do_list.csv"
 SCHEDULE_FILE = "task_schedule.csv"
@@ -14,6 +17,7 @@ MARKS_FILE = "marks_data.csv"
 # ---------- Data Storage ----------
 to_do_list = []
 task_schedule = {}
+search_index = SearchIndex()
 
 # ---------- Data Loaders ----------
 def load_data():
@@ -31,8 +35,11 @@ def load_data():
                 task_schedule[date] = []
             task_schedule[date].append(task)
 
+    search_index.sync("tasks", task_documents(to_do_list))
+
 # ---------- Data Saver ----------
 def save_data():
+    search_index.sync("tasks", task_documents(to_do_list))
     pd.DataFrame(to_do_list).to_csv(TODO_FILE, index=False)
     schedule_data = [(d, t) for d in task_schedule for t in task_schedule[d]]
     pd.DataFrame(schedule_data, columns=["Date", "Task"]).to_csv(SCHEDULE_FILE, index=False)
@@ -46,7 +53,13 @@ def add_task():
         messagebox.showerror("Error", "Please enter both task and date")
         return
 
-    to_do_list.append({"Task": task, "Date": date, "Task Type": task_type})
+    try:
+        new_task = Task(task, date, task_type)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+
+    to_do_list.append(new_task.to_row())
     if date not in task_schedule:
         task_schedule[date] = []
     task_schedule[date].append(task)
@@ -75,7 +88,11 @@ def delete_selected():
 # ---------- Display Updater ----------
 def update_display():
     todo_tree.delete(*todo_tree.get_children())
+    query = search_entry.get().strip()
+    matches = {result["task"] for result in search_index.search(query, limit=None)} if query else None
     for task in to_do_list:
+        if matches is not None and task['Task'] not in matches:
+            continue
         todo_tree.insert("", "end", values=(task['Task'], task['Date'], task['Task Type']))
 
 # ---------- Load Marks File ----------
@@ -109,6 +126,11 @@ type_entry.grid(row=0, column=5)
 
 tk.Button(frame, text="Add Task", command=add_task).grid(row=0, column=6, padx=5)
 
+tk.Label(frame, text="Search").grid(row=1, column=0, padx=5, pady=5)
+search_entry = tk.Entry(frame, width=30)
+search_entry.grid(row=1, column=1, pady=5)
+search_entry.bind("<KeyRelease>", lambda event: update_display())
+
 # ========== Task Table ==========
 columns = ("Task", "Date", "Task Type")
 todo_tree = ttk.Treeview(root, columns=columns, show="headings", height=10)
@@ -1,27 +1,160 @@
 # planner/ai_planner.py
 
-import openai
-from dotenv import load_dotenv
+import ast
+import hashlib
+import json
 import os
+import threading
+from abc import ABC, abstractmethod
 
-# Load environment variables (OpenAI API key)
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Backend used when none is passed: "openai", "local" or "stub"
+DEFAULT_BACKEND = "openai"
+LOCAL_BASE_URL = "http://localhost:11434/v1"
 
-def generate_plan_with_ai(subject, topics):
+
+class PlanBackend(ABC):
+    """
+    Text completion backend used by the planner.
+    """
+    name = "base"
+
+    @abstractmethod
+    def complete(self, prompt):
+        """
+        Return the model's text answer to the prompt.
+        """
+
+
+class OpenAIBackend(PlanBackend):
+    """
+    OpenAI chat completions. The client (and its pooled HTTP connections) is created on
+    first use and reused; the API key is read then, not at import time.
+    """
+    name = "openai"
+
+    def __init__(self, model="gpt-4o-mini", api_key=None, base_url=None, max_tokens=1024, temperature=0.7):
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client is None:
+                from dotenv import load_dotenv
+                from openai import OpenAI
+
+                load_dotenv()
+                api_key = self.api_key or os.getenv("OPENAI_API_KEY")
+                self._client = OpenAI(api_key=api_key, base_url=self.base_url)
+            return self._client
+
+    def complete(self, prompt):
+        response = self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+        return response.choices[0].message.content.strip()
+
+
+class LocalBackend(OpenAIBackend):
+    """
+    On-box model server with an OpenAI-compatible API (Ollama, llama.cpp server, vLLM).
+    Nothing leaves the machine, so it works in air-gapped setups.
+    """
+    name = "local"
+
+    def __init__(self, model=None, base_url=None, **kwargs):
+        super().__init__(
+            model=model or os.getenv("LOCAL_LLM_MODEL", "llama3"),
+            api_key="local",
+            base_url=base_url or os.getenv("LOCAL_LLM_URL", LOCAL_BASE_URL),
+            **kwargs,
+        )
+
+
+class StubBackend(PlanBackend):
+    """
+    Deterministic offline backend for tests and load tests: no network, same answer
+    for the same topics every time.
+    """
+    name = "stub"
+
+    def complete(self, prompt):
+        topics = prompt.split("cover:", 1)[-1].split("Break down", 1)[0]
+        plan = {}
+        for topic in (t.strip() for t in topics.split(",")):
+            if topic:
+                digest = hashlib.sha1(topic.encode("utf-8")).digest()
+                plan[topic] = 1 + digest[0] % 4
+        return json.dumps(plan)
+
+
+_BACKENDS = {"openai": OpenAIBackend, "local": LocalBackend, "stub": StubBackend}
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def backend_name(name=None):
+    """
+    Resolve a backend name; defaults to the PLANNER_BACKEND environment variable, then OpenAI.
     """
-    Generate a detailed study plan using LangChain and OpenAI's GPT model.
+    name = name or os.getenv("PLANNER_BACKEND", DEFAULT_BACKEND)
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown planner backend '{name}'. Choose from: {', '.join(_BACKENDS)}.")
+    return name
+
+
+def get_backend(name=None):
+    """
+    Shared backend instance by name; defaults to the PLANNER_BACKEND environment variable.
+    """
+    name = backend_name(name)
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = _BACKENDS[name]()
+        return _instances[name]
+
+
+def _parse_plan(plan_text):
+    """
+    Parse the model output into a dict without evaluating code.
+    """
+    start, end = plan_text.find("{"), plan_text.rfind("}")
+    if start != -1 and end > start:
+        plan_text = plan_text[start:end + 1]
+    try:
+        plan = json.loads(plan_text)
+    except json.JSONDecodeError:
+        plan = ast.literal_eval(plan_text)
+    if not isinstance(plan, dict):
+        raise ValueError("the response is not a dictionary")
+    return plan
+
+
+def generate_plan_with_ai(subject, topics, backend=None):
+    """
+    Generate a detailed study plan using a language model backend.
     The model will break down topics and estimate hours for each.
 
     Parameters:
         subject (str): Subject the user is studying (e.g., Physics, Chemistry).
         topics (list): List of topics to be studied, given by the user.
+        backend (PlanBackend or str): Backend or backend name ("openai", "local", "stub").
+            Defaults to the PLANNER_BACKEND environment variable, then OpenAI.
 
     Returns:
         dict: Breakdown of topics and their estimated hours.
     """
+    if backend is None or isinstance(backend, str):
+        backend = get_backend(backend)
 
-    # Construct the prompt for OpenAI GPT
+    # Construct the prompt for the model
     prompt = f"""
     I am studying {subject}. Below are the topics I need to cover:
 
@@ -32,21 +165,13 @@ def generate_plan_with_ai(subject, topics):
     Provide the breakdown as a dictionary where the key is the topic/subtopic and the value is the estimated hours to study.
     """
 
-    # Send the request to the OpenAI API
-    response = openai.Completion.create(
-        engine="text-davinci-003",  # You can use different engines, e.g., "gpt-4" if available
-        prompt=prompt,
-        max_tokens=150,
-        temperature=0.7,
-    )
-
-    # Get the generated text from the response
-    plan_text = response.choices[0].text.strip()
+    try:
+        plan_text = backend.complete(prompt)
+    except Exception as e:
+        return {"error": f"AI backend request failed: {str(e)}"}
 
-    # Convert the output text into a dictionary (assuming the model provides it in the correct format)
-    # For simplicity, you might need to parse or clean up the response if it's not well-formed JSON
     try:
-        ai_plan = eval(plan_text)  # Evaluating as Python dictionary (ensure response is safe)
+        ai_plan = _parse_plan(plan_text)
     except Exception as e:
         return {"error": f"Failed to parse AI plan: {str(e)}"}
 
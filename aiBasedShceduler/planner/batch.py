@@ -0,0 +1,307 @@
+# planner/batch.py
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from planner.ai_planner import backend_name
+from planner.jobs import job_id_for
+from planner.models import parse_number
+
+# Output layout: BATCH_DIR/students/<student>.json, BATCH_DIR/plans/<key>.json, BATCH_DIR/summary.csv
+BATCH_DIR = "data/batch"
+SUMMARY_COLUMNS = ["student", "status", "topics", "total_hours", "study_days", "last_day", "error"]
+
+
+# ---------- Manifest ----------
+def _normalize_student(raw):
+    """
+    Validate one manifest entry.
+
+    Accepts subjects as {subject: [topics]} or [{"subject", "topics"}], with topics as a
+    list or a comma separated string.
+    """
+    student_id = str(raw.get("id") or raw.get("name") or "").strip()
+    if not student_id:
+        raise ValueError("missing student id")
+
+    subjects = raw.get("subjects") or {}
+    if isinstance(subjects, list):
+        subjects = {item["subject"]: item["topics"] for item in subjects}
+    normalized = {}
+    for subject, topics in subjects.items():
+        if isinstance(topics, str):
+            topics = topics.split(",")
+        topics = [str(topic).strip() for topic in topics if str(topic).strip()]
+        if topics:
+            normalized[str(subject).strip()] = topics
+    if not normalized:
+        raise ValueError("no subjects with topics")
+
+    hours_per_day = parse_number(raw.get("hours_per_day"), "hours_per_day")
+    deadline_days = parse_number(raw.get("deadline_days"), "deadline_days")
+    if hours_per_day <= 0 or deadline_days < 1 or deadline_days != int(deadline_days):
+        raise ValueError("hours_per_day must be positive and deadline_days a whole number of days")
+
+    student = {
+        "id": student_id,
+        "subjects": normalized,
+        "hours_per_day": hours_per_day,
+        "deadline_days": int(deadline_days),
+    }
+    if raw.get("start_date"):
+        student["start_date"] = str(raw["start_date"])
+    return student
+
+
+def load_manifest(path):
+    """
+    Read students from a JSON manifest (a list, or {"students": [...]}) or a JSONL file.
+
+    Returns:
+        tuple: (list of student dicts, list of error messages for rejected entries).
+    """
+    errors = []
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            entries = []
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Keep the numbering of the other entries; the bad line is reported below
+                    entries.append(None)
+        else:
+            entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get("students", [])
+
+    students, seen = [], set()
+    for number, raw in enumerate(entries, start=1):
+        if raw is None:
+            errors.append(f"Entry {number}: invalid JSON")
+            continue
+        try:
+            student = _normalize_student(raw)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            errors.append(f"Entry {number}: {e}")
+            continue
+        if student["id"] in seen:
+            errors.append(f"Entry {number}: duplicate student id '{student['id']}'")
+            continue
+        seen.add(student["id"])
+        students.append(student)
+    return students, errors
+
+
+# ---------- Files ----------
+def _safe_name(name):
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name) or "student"
+
+
+def _student_path(out_dir, student):
+    # The hash keeps ids that sanitize to the same name apart
+    return os.path.join(out_dir, "students", f"{_safe_name(student['id'])}-{job_id_for('id', student['id'])[:6]}.json")
+
+
+def _plan_key(subject, topics, backend):
+    return job_id_for("plan", {"subject": subject, "topics": topics, "backend": backend})
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _completed(out_dir, student):
+    """
+    The saved result if this exact student input was already planned successfully.
+    """
+    result = _read_json(_student_path(out_dir, student))
+    if result and result["status"] == "done" and result["input"] == job_id_for("student", student):
+        return result
+    return None
+
+
+# ---------- Workers (run in the process pool) ----------
+def _plan_worker(subject, topics, backend, path):
+    from planner.ai_planner import generate_plan_with_ai
+
+    plan = generate_plan_with_ai(subject, topics, backend)
+    if "error" not in plan:
+        _write_json(path, plan)
+    return plan
+
+
+def _schedule_worker(student, ai_plan, out_dir):
+    """
+    Solve one student's schedule and write it; the result file doubles as the resume marker.
+    """
+    from planner.scheduler import generate_schedule
+
+    result = {"student": student["id"], "input": job_id_for("student", student), "start_date": student.get("start_date")}
+    # Each process runs one single-threaded solve, so the pool uses every core without oversubscribing
+    schedule = generate_schedule(ai_plan, student["hours_per_day"], student["deadline_days"],
+                                 num_workers=1, compact=True)
+    if isinstance(schedule, dict):
+        result.update(status="failed", error=schedule["error"], ai_plan=ai_plan)
+    else:
+        load = schedule.day_load()
+        result.update(status="done", ai_plan=ai_plan, total_hours=round(schedule.total_hours(), 2),
+                      study_days=len(load), last_day=max(load, default=""), schedule=schedule.to_dict())
+    _write_json(_student_path(out_dir, student), result)
+    return _summary_row(result)
+
+
+def _summary_row(result):
+    return {
+        "student": result["student"],
+        "status": result["status"],
+        "topics": len(result.get("ai_plan") or {}),
+        "total_hours": result.get("total_hours", 0),
+        "study_days": result.get("study_days", 0),
+        "last_day": result.get("last_day", ""),
+        "error": result.get("error", ""),
+    }
+
+
+# ---------- Batch run ----------
+def run_batch(manifest, out_dir=BATCH_DIR, workers=None, backend=None, resume=True, progress=None):
+    """
+    Plan and schedule every student of a manifest on a process pool.
+
+    AI plans are requested once per distinct (subject, topics) and cached in out_dir/plans,
+    then each student's subjects are merged into one plan and solved with CP-SAT. Every
+    student gets out_dir/students/<id>.json and the run writes out_dir/summary.csv. With
+    resume, students whose input was already planned successfully are skipped, so an
+    interrupted run continues where it stopped.
+
+    Parameters:
+        manifest (str): Path of the JSON/JSONL manifest.
+        out_dir (str): Output directory.
+        workers (int): Pool size; defaults to the number of cores.
+        backend (str): Planner backend name ("openai", "local", "stub").
+        resume (bool): Skip students completed by an earlier run.
+        progress (callable): Called with each finished student's summary row.
+
+    Returns:
+        dict: {"students", "done", "failed", "skipped", "invalid", "errors", "summary"}.
+    """
+    # Resolve the default backend, so cached plans are keyed by the backend that made them
+    backend = backend_name(backend)
+    students, errors = load_manifest(manifest)
+    rows = {}
+    pending = []
+    for student in students:
+        result = _completed(out_dir, student) if resume else None
+        if result:
+            rows[student["id"]] = _summary_row(result)
+        else:
+            pending.append(student)
+    skipped = len(rows)
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        # AI plans: one request per distinct subject and topic list, cached across runs
+        plans, futures, requested = {}, {}, set()
+        for student in pending:
+            for subject, topics in student["subjects"].items():
+                key = _plan_key(subject, topics, backend)
+                if key in plans or key in requested:
+                    continue
+                requested.add(key)
+                path = os.path.join(out_dir, "plans", f"{key}.json")
+                cached = _read_json(path)
+                if cached is not None:
+                    plans[key] = cached
+                else:
+                    futures[pool.submit(_plan_worker, subject, topics, backend, path)] = key
+        for future in as_completed(futures):
+            try:
+                plans[futures[future]] = future.result()
+            except Exception as e:
+                plans[futures[future]] = {"error": f"AI backend request failed: {e}"}
+
+        # Schedules
+        futures = {}
+        for student in pending:
+            ai_plan, error = {}, None
+            for subject, topics in student["subjects"].items():
+                plan = plans[_plan_key(subject, topics, backend)]
+                if "error" in plan:
+                    error = f"{subject}: {plan['error']}"
+                    break
+                ai_plan.update({f"{subject} - {topic}": hours for topic, hours in plan.items()})
+            if error:
+                result = {"student": student["id"], "input": job_id_for("student", student),
+                          "status": "failed", "error": error}
+                _write_json(_student_path(out_dir, student), result)
+                rows[student["id"]] = _summary_row(result)
+                if progress:
+                    progress(rows[student["id"]])
+            else:
+                futures[pool.submit(_schedule_worker, student, ai_plan, out_dir)] = student
+        for future in as_completed(futures):
+            student = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                row = _summary_row({"student": student["id"], "status": "failed", "error": str(e)})
+            rows[student["id"]] = row
+            if progress:
+                progress(row)
+
+    summary = [rows[student["id"]] for student in students]
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(summary)
+
+    return {
+        "students": len(students),
+        "done": sum(row["status"] == "done" for row in summary),
+        "failed": sum(row["status"] == "failed" for row in summary),
+        "skipped": skipped,
+        "invalid": len(errors),
+        "errors": errors,
+        "summary": summary,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan and schedule many students from a manifest.")
+    parser.add_argument("manifest", help="JSON or JSONL file of students")
+    parser.add_argument("--out", default=BATCH_DIR, help="Output directory")
+    parser.add_argument("--workers", type=int, help="Process pool size (defaults to all cores)")
+    parser.add_argument("--backend", choices=["openai", "local", "stub"], help="Planner backend")
+    parser.add_argument("--no-resume", action="store_true", help="Re-plan students finished by an earlier run")
+    args = parser.parse_args(argv)
+
+    def show(row):
+        detail = f"{row['total_hours']} h over {row['study_days']} days" if row["status"] == "done" else row["error"]
+        print(f"  {row['student']}: {row['status']} - {detail}")
+
+    report = run_batch(args.manifest, args.out, args.workers, args.backend, not args.no_resume, show)
+    print(f"Planned {report['done']} of {report['students']} students ({report['skipped']} already done), "
+          f"{report['failed']} failed, {report['invalid']} invalid manifest entries.")
+    for error in report["errors"]:
+        print(f"  {error}")
+    print(f"Summary written to {os.path.join(args.out, 'summary.csv')}")
+
+
+if __name__ == "__main__":
+    main()
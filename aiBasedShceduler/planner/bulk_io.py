@@ -0,0 +1,378 @@
+# planner/bulk_io.py
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+from itertools import islice
+
+from planner.models import MAX_SCORES, Mark, MockTest, PlanEntry
+
+# Data files used by the apps (relative to the app directory)
+MARKS_FILE = "data/marks.csv"
+PLAN_FILE = "data/study_plan.json"
+MOCK_TEST_FILE = "jee_iat_data.json"
+
+MARKS_COLUMNS = ["Date", "Subject", "Test Type", "Score", "Total", "Notes"]
+MOCK_TEST_FIELDS = ["score", "accuracy", "date", "time_taken"]
+PLAN_FIELDS = ["date", "subject", "topic", "duration"]
+
+BATCH_SIZE = 10000
+# Record fingerprints kept in memory for dedupe before spilling to a temporary SQLite table
+MAX_MEMORY_KEYS = 200000
+
+
+# ---------- Validation ----------
+def _normalize_mark(row):
+    return Mark.from_dict(row).to_dict()
+
+
+def _normalize_mock_test(kind, row):
+    return MockTest.from_dict(row, kind).to_dict()
+
+
+def _normalize_plan(row):
+    entry = PlanEntry.from_dict(row)
+    return {"date": entry.date.isoformat(), **entry.to_dict()}
+
+
+def _record_key(record, fields):
+    """
+    Compact fingerprint of a record, so dedupe memory stays small for millions of rows.
+    """
+    raw = "\x1f".join(str(record[field]) for field in fields)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest()
+
+
+class _KeySet:
+    """
+    Set of record fingerprints for dedupe. Past max_memory keys it moves them into a
+    temporary on-disk SQLite table, so memory stays bounded however many rows an import has.
+    """
+
+    def __init__(self, max_memory=MAX_MEMORY_KEYS):
+        self.max_memory = max_memory
+        self.keys = set()
+        self.db = None
+
+    def add(self, key):
+        """
+        Add a key. Returns False if it was already present.
+        """
+        if self.db is not None:
+            return self.db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 1
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        if len(self.keys) > self.max_memory:
+            self.db = sqlite3.connect("")  # "" is a private temporary database on disk
+            self.db.execute("CREATE TABLE seen (key BLOB PRIMARY KEY) WITHOUT ROWID")
+            self.db.executemany("INSERT INTO seen VALUES (?)", ((key,) for key in self.keys))
+            self.keys = set()
+        return True
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+
+
+# ---------- Streaming readers / writers ----------
+def _format_of(path, fmt):
+    if fmt:
+        return fmt
+    if path.endswith(".json"):
+        return "json"
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_rows(path, fmt=None):
+    """
+    Stream rows of a CSV (with header) or JSONL file as dicts, one at a time. A .json file
+    must hold one array of objects and is read whole, so large files should use JSONL.
+
+    Yields:
+        tuple: (row dict, None), or (None, error message) for a row that is not a JSON object.
+    """
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        fmt = _format_of(path, fmt)
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield row, None
+        elif fmt == "json":
+            rows = json.load(f)
+            if not isinstance(rows, list):
+                raise ValueError(f"{path} must contain a JSON array of objects")
+            for row in rows:
+                if isinstance(row, dict):
+                    yield row, None
+                else:
+                    yield None, f"expected a JSON object, got {type(row).__name__}"
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield None, f"invalid JSON: {e}"
+                    continue
+                if isinstance(row, dict):
+                    yield row, None
+                else:
+                    yield None, f"expected a JSON object, got {type(row).__name__}"
+
+
+def write_rows(path, rows, fields, fmt=None):
+    """
+    Stream dict rows to a CSV, JSON array or JSONL file.
+
+    Returns:
+        int: Number of rows written.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        fmt = _format_of(path, fmt)
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        elif fmt == "json":
+            f.write("[")
+            for row in rows:
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(row, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n")
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+    return count
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------- Stores ----------
+class _MarksStore:
+    """
+    data/marks.csv: new rows are appended batch by batch, the file is never rewritten.
+    """
+    fields = MARKS_COLUMNS
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        if os.path.exists(path):
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                has_rows = next(reader, None) is not None
+            if header and has_rows:
+                self.header = header
+
+    def normalize(self, row):
+        return _normalize_mark(row)
+
+    def existing(self):
+        if self.header is None:
+            return
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    yield _normalize_mark(row)
+                except ValueError:
+                    continue
+
+    def commit(self, batch):
+        if self.header is None:
+            # Missing or header-only file: start it with the app's columns
+            self.header = MARKS_COLUMNS
+            mode = "w"
+        else:
+            mode = "a"
+        with open(self.path, mode, newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.header, extrasaction="ignore")
+            if mode == "w":
+                writer.writeheader()
+            writer.writerows(batch)
+
+    def close(self):
+        pass
+
+
+class _JsonStore:
+    """
+    JSON documents (mock tests, study plan) can only be written whole, so batches are
+    collected in memory and the file is saved once when the import finishes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.dirty = False
+        try:
+            with open(path, "r") as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.data = self.empty()
+
+    def commit(self, batch):
+        self.append(batch)
+        self.dirty = True
+
+    def close(self):
+        if self.dirty:
+            with open(self.path, "w") as f:
+                json.dump(self.data, f, indent=self.indent)
+
+
+class _MockTestStore(_JsonStore):
+    fields = MOCK_TEST_FIELDS
+    indent = 4
+
+    def __init__(self, path, kind):
+        self.kind = kind
+        self.section = f"{kind}_mock_tests"
+        super().__init__(path)
+        self.data.setdefault(self.section, [])
+
+    def empty(self):
+        return {"study_progress": [], "jee_mock_tests": [], "iat_mock_tests": [], "jee_performance": []}
+
+    def normalize(self, row):
+        return _normalize_mock_test(self.kind, row)
+
+    def existing(self):
+        return iter(self.data[self.section])
+
+    def append(self, batch):
+        self.data[self.section].extend(batch)
+
+
+class _PlanStore(_JsonStore):
+    fields = PLAN_FIELDS
+    indent = 2
+
+    def empty(self):
+        return {}
+
+    def normalize(self, row):
+        return _normalize_plan(row)
+
+    def existing(self):
+        for plan_date, entries in self.data.items():
+            for entry in entries:
+                yield {"date": plan_date, **entry}
+
+    def append(self, batch):
+        for record in batch:
+            self.data.setdefault(record["date"], []).append(
+                {"subject": record["subject"], "topic": record["topic"], "duration": record["duration"]})
+
+
+def open_store(target, path=None):
+    """
+    Open the data store for a target: "marks", "jee", "iat" or "plans".
+    """
+    if target == "marks":
+        return _MarksStore(path or MARKS_FILE)
+    if target in MAX_SCORES:
+        return _MockTestStore(path or MOCK_TEST_FILE, target)
+    if target == "plans":
+        return _PlanStore(path or PLAN_FILE)
+    raise ValueError(f"Unknown target '{target}'. Choose from: marks, jee, iat, plans.")
+
+
+# ---------- Import / Export ----------
+def import_records(target, source, fmt=None, store_path=None, batch_size=BATCH_SIZE, max_errors=20):
+    """
+    Stream a CSV/JSONL (or JSON array) file into a data store.
+
+    Rows are validated with the same range checks as the forms, deduplicated against
+    the existing data and the file itself, and committed in batches.
+
+    Returns:
+        dict: Counts of imported, duplicate and invalid rows, plus the first row errors.
+    """
+    store = open_store(target, store_path)
+    seen = _KeySet()
+    for record in store.existing():
+        seen.add(_record_key(record, store.fields))
+    report = {"imported": 0, "duplicates": 0, "invalid": 0, "errors": []}
+
+    def valid_rows():
+        for line, (row, error) in enumerate(read_rows(source, fmt), start=1):
+            if error is None:
+                try:
+                    record = store.normalize(row)
+                except (ValueError, TypeError, AttributeError) as e:
+                    error = str(e)
+            if error is not None:
+                report["invalid"] += 1
+                if len(report["errors"]) < max_errors:
+                    report["errors"].append(f"row {line}: {error}")
+                continue
+            if not seen.add(_record_key(record, store.fields)):
+                report["duplicates"] += 1
+                continue
+            yield record
+
+    try:
+        for batch in _chunks(valid_rows(), batch_size):
+            store.commit(batch)
+            report["imported"] += len(batch)
+    finally:
+        seen.close()
+    store.close()
+    return report
+
+
+def export_records(target, destination, fmt=None, store_path=None):
+    """
+    Stream every record of a data store to a CSV/JSONL file.
+
+    Returns:
+        int: Number of records written.
+    """
+    store = open_store(target, store_path)
+    return write_rows(destination, store.existing(), store.fields, fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export of marks, mock tests and study plans.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("target", choices=["marks", "jee", "iat", "plans"])
+    parser.add_argument("file", help="CSV, JSONL or JSON array file to read from / write to")
+    parser.add_argument("--format", choices=["csv", "jsonl", "json"], help="Defaults to the file extension")
+    parser.add_argument("--store", help="Data file to use instead of the app default")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.action == "import":
+        try:
+            report = import_records(args.target, args.file, args.format, args.store, args.batch_size)
+        except ValueError as e:
+            parser.exit(1, f"Import failed: {e}\n")
+        print(f"Imported {report['imported']} rows, skipped {report['duplicates']} duplicates "
+              f"and {report['invalid']} invalid rows.")
+        for error in report["errors"]:
+            print(f"  {error}")
+    else:
+        count = export_records(args.target, args.file, args.format, args.store)
+        print(f"Exported {count} rows to {args.file}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# planner/calendar_export.py
+
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta, timezone
+
+# Feeds are written to FEEDS_DIR/<user>.ics and .csv; per-day fragments live in FEEDS_DIR/<user>/
+FEEDS_DIR = "data/feeds"
+CSV_COLUMNS = ["Date", "Start", "End", "Summary", "Hours"]
+
+_ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//aiScheduler//Study Plan//EN\r\nCALSCALE:GREGORIAN\r\n"
+_ICS_FOOTER = "END:VCALENDAR\r\n"
+
+
+# ---------- Collecting events per day ----------
+def schedule_days(schedule, start_date):
+    """
+    Events from a generate_schedule result ("Day N" -> timed entries), with Day 1 on start_date.
+    """
+    start_date = date.fromisoformat(str(start_date))
+    days = {}
+    for label, entries in schedule.items():
+        if label == "error":
+            continue
+        day = str(start_date + timedelta(days=int(label.split()[1]) - 1))
+        for entry in entries:
+            days.setdefault(day, []).append({
+                "summary": entry["topic"], "start": entry["start"], "end": entry["end"], "hours": entry["hours"]})
+    return days
+
+
+def plan_days(study_plan):
+    """
+    All-day events from the strmApp study plan (date -> [{"subject", "topic", "duration"}]).
+    """
+    return {
+        day: [{"summary": f"{entry['subject']} - {entry['topic']}", "start": None, "end": None,
+               "hours": entry["duration"]} for entry in entries]
+        for day, entries in study_plan.items() if entries
+    }
+
+
+def task_days(tasks):
+    """
+    All-day events from dated tasks: the strmApp schedule list ([{"date", "task"}]) or the
+    main.py task schedule (date -> [task]).
+    """
+    pairs = tasks.items() if isinstance(tasks, dict) else ((item["date"], [item["task"]]) for item in tasks)
+    days = {}
+    for day, names in pairs:
+        for name in names:
+            days.setdefault(str(day), []).append({"summary": name, "start": None, "end": None, "hours": ""})
+    return days
+
+
+def merge_days(*sources):
+    merged = {}
+    for days in sources:
+        for day, events in days.items():
+            merged.setdefault(day, []).extend(events)
+    return merged
+
+
+# ---------- Rendering ----------
+def _escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line):
+    """
+    Fold a content line at 75 octets as RFC 5545 requires.
+    """
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, current = [], b""
+    for char in line:
+        encoded = char.encode("utf-8")
+        if len(current) + len(encoded) > (75 if not parts else 74):
+            parts.append(current.decode("utf-8"))
+            current = b""
+        current += encoded
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _render_ics(day, events, stamp):
+    compact = day.replace("-", "")
+    next_day = (date.fromisoformat(day) + timedelta(days=1)).strftime("%Y%m%d")
+    lines = []
+    occurrences = {}
+    for event in events:
+        # Keyed by content, not position, so adding or removing another event keeps this UID
+        key = (event["summary"], event["start"] or "")
+        occurrences[key] = occurrences.get(key, 0) + 1
+        uid = hashlib.sha1(f"{day}|{event['summary']}|{key[1]}|{occurrences[key]}".encode("utf-8")).hexdigest()
+        lines += ["BEGIN:VEVENT", f"UID:{uid}@aischeduler", f"DTSTAMP:{stamp}"]
+        if event["start"]:
+            lines.append(f"DTSTART:{compact}T{event['start'].replace(':', '')}00")
+            lines.append(f"DTEND:{compact}T{event['end'].replace(':', '')}00" if event["end"] < "24:00"
+                         else f"DTEND:{next_day}T000000")
+        else:
+            lines += [f"DTSTART;VALUE=DATE:{compact}", f"DTEND;VALUE=DATE:{next_day}"]
+        summary = event["summary"] + (f" ({event['hours']} hrs)" if event["hours"] != "" and not event["start"] else "")
+        lines += [f"SUMMARY:{_escape(summary)}", "END:VEVENT"]
+    return "".join(_fold(line) for line in lines)
+
+
+def _render_csv(day, events):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for event in events:
+        writer.writerow([day, event["start"] or "", event["end"] or "", event["summary"], event["hours"]])
+    return buffer.getvalue()
+
+
+def _day_hash(events):
+    return hashlib.sha1(json.dumps(events, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# ---------- Export ----------
+def _write_atomic(path, text):
+    with open(path + ".tmp", "w", newline="", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _assemble(path, header, fragment_paths, footer):
+    """
+    Stream the per-day fragments into one feed file without loading them all.
+    """
+    with open(path + ".tmp", "w", newline="", encoding="utf-8") as out:
+        out.write(header)
+        for fragment_path in fragment_paths:
+            with open(fragment_path, "r", newline="", encoding="utf-8") as fragment:
+                shutil.copyfileobj(fragment, out)
+        out.write(footer)
+    os.replace(path + ".tmp", path)
+
+
+def export_feeds(user, days, feeds_dir=FEEDS_DIR):
+    """
+    Write <user>.ics and <user>.csv for the given day -> events mapping.
+
+    Only days whose events changed since the last export (by content hash) are rendered
+    again; the feed files are then streamed together from the cached per-day fragments.
+    Nothing is rewritten when no day changed. Days that are not ISO dates (YYYY-MM-DD)
+    cannot be placed on a calendar and are skipped.
+
+    Returns:
+        dict: {"changed", "removed", "skipped", "ics", "csv"} with the number of re-rendered
+        and dropped days and the list of skipped day keys.
+    """
+    safe_user = "".join(c if c.isalnum() or c in "-_" else "_" for c in user) or "user"
+    fragments_dir = os.path.join(feeds_dir, safe_user)
+    os.makedirs(fragments_dir, exist_ok=True)
+    manifest_path = os.path.join(fragments_dir, "manifest.json")
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    ics_path = os.path.join(feeds_dir, f"{safe_user}.ics")
+    csv_path = os.path.join(feeds_dir, f"{safe_user}.csv")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    # Normalized ISO days also keep the fragment file names safe
+    dated, skipped = {}, []
+    for day, events in days.items():
+        try:
+            iso_day = date.fromisoformat(str(day)).isoformat()
+        except ValueError:
+            skipped.append(str(day))
+            continue
+        dated.setdefault(iso_day, []).extend(events)
+
+    changed = 0
+    new_manifest = {}
+    for day, events in dated.items():
+        if not events:
+            continue
+        digest = _day_hash(events)
+        new_manifest[day] = digest
+        if manifest.get(day) != digest or not os.path.exists(os.path.join(fragments_dir, f"{day}.ics")):
+            _write_atomic(os.path.join(fragments_dir, f"{day}.ics"), _render_ics(day, events, stamp))
+            _write_atomic(os.path.join(fragments_dir, f"{day}.csv"), _render_csv(day, events))
+            changed += 1
+
+    removed = [day for day in manifest if day not in new_manifest]
+    for day in removed:
+        for extension in (".ics", ".csv"):
+            path = os.path.join(fragments_dir, day + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+    if changed or removed or not os.path.exists(ics_path) or not os.path.exists(csv_path):
+        ordered = sorted(new_manifest)
+        _assemble(ics_path, _ICS_HEADER, [os.path.join(fragments_dir, f"{day}.ics") for day in ordered], _ICS_FOOTER)
+        _assemble(csv_path, ",".join(CSV_COLUMNS) + "\r\n",
+                  [os.path.join(fragments_dir, f"{day}.csv") for day in ordered], "")
+        _write_atomic(manifest_path, json.dumps(new_manifest, indent=2))
+
+    return {"changed": changed, "removed": len(removed), "skipped": skipped, "ics": ics_path, "csv": csv_path}
@@ -0,0 +1,293 @@
+# planner/jobs.py
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+
+# Directory where job status and results are persisted; AI plans are cached in JOBS_DIR/plans
+# and JOBS_DIR/pending holds one marker per finished job whose result is not applied yet
+JOBS_DIR = "data/jobs"
+MAX_WORKERS = 2
+
+# The module survives Streamlit reruns, so the pool and in-flight futures live here
+_executor = None
+_futures = {}
+_plan_futures = {}  # AI plan key -> backend call shared by every plan job waiting for it
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _executor
+
+
+def _job_path(job_id):
+    return os.path.join(JOBS_DIR, f"{job_id}.json")
+
+
+def _save_job(job):
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    tmp_path = _job_path(job["id"]) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(job, f, indent=2)
+    os.replace(tmp_path, _job_path(job["id"]))
+
+
+def _pending_path(job_id):
+    return os.path.join(JOBS_DIR, "pending", job_id)
+
+
+def _load_job(job_id):
+    try:
+        with open(_job_path(job_id), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def job_id_for(kind, params):
+    """
+    Build a stable job ID from the job kind and its input, so identical requests share one job.
+    """
+    payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def run_ai_plan_job(subject, topics, backend):
+    """
+    Worker entry point: ask the AI planner for a plan.
+    Runs in a separate process, so planner modules are imported here.
+    """
+    from planner.ai_planner import generate_plan_with_ai
+
+    return generate_plan_with_ai(subject, topics, backend)
+
+
+def run_schedule_job(ai_plan, params):
+    """
+    Worker entry point: schedule an AI plan.
+
+    Returns:
+        dict: {"ai_plan": ..., "schedule": ...} or {"error": ...}
+    """
+    from planner.scheduler import generate_schedule
+
+    schedule = generate_schedule(ai_plan, params["hours_per_day"], params["deadline_days"], sparse=True)
+    if "error" in schedule:
+        return schedule
+    return {"ai_plan": ai_plan, "schedule": schedule}
+
+
+def _on_done(job_id, future):
+    job = _load_job(job_id) or {"id": job_id}
+    job["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        result = future.result()
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+    else:
+        if "error" in result:
+            job["status"] = "failed"
+            job["error"] = result["error"]
+        else:
+            job["status"] = "done"
+            job["result"] = result
+    try:
+        try:
+            _save_job(job)
+        except (TypeError, ValueError) as e:
+            # A result that cannot be stored fails the job instead of leaving it running
+            job.pop("result", None)
+            job.update(status="failed", error=f"Could not save the result: {e}")
+            _save_job(job)
+        if job["status"] == "done":
+            os.makedirs(os.path.dirname(_pending_path(job_id)), exist_ok=True)
+            open(_pending_path(job_id), "w").close()
+    finally:
+        with _lock:
+            _futures.pop(job_id, None)
+
+
+def submit_job(kind, func, params):
+    """
+    Queue func(params) on the process pool and return its job ID.
+
+    A job with the same kind and input that is still running is reused instead of being
+    submitted again; a finished one is run again and its new result can be applied again.
+    """
+    job_id = job_id_for(kind, params)
+    with _lock:
+        if job_id in _futures:
+            return job_id
+        _start_job(job_id, kind, params)
+        future = _get_executor().submit(func, params)
+        _futures[job_id] = future
+    future.add_done_callback(lambda f: _on_done(job_id, f))
+    return job_id
+
+
+def _start_job(job_id, kind, params):
+    # A result of an earlier run that was never applied is replaced by this run's result
+    try:
+        os.remove(_pending_path(job_id))
+    except FileNotFoundError:
+        pass
+    _save_job({
+        "id": job_id,
+        "kind": kind,
+        "params": params,
+        "status": "running",
+        "submitted_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def _plan_path(key):
+    return os.path.join(JOBS_DIR, "plans", f"{key}.json")
+
+
+def _on_plan_done(key, future):
+    # Cache the plan before dropping the in-flight entry, so a new request finds one or the other
+    try:
+        plan = future.result()
+    except Exception:
+        plan = None
+    if plan is not None and "error" not in plan:
+        try:
+            os.makedirs(os.path.dirname(_plan_path(key)), exist_ok=True)
+            with open(_plan_path(key) + ".tmp", "w") as f:
+                json.dump(plan, f, indent=2)
+            os.replace(_plan_path(key) + ".tmp", _plan_path(key))
+        except (OSError, TypeError, ValueError):
+            pass
+    with _lock:
+        _plan_futures.pop(key, None)
+
+
+def _ai_plan_future(subject, topics, backend):
+    """
+    Future of the AI plan for (backend, subject, topics): the cached plan, the backend call
+    already in flight for it, or a new call. Called with _lock held.
+    """
+    key = job_id_for("ai_plan", {"subject": subject, "topics": topics, "backend": backend})
+    if key in _plan_futures:
+        return _plan_futures[key]
+    future = Future()
+    try:
+        with open(_plan_path(key), "r") as f:
+            future.set_result(json.load(f))
+        return future
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    future = _get_executor().submit(run_ai_plan_job, subject, topics, backend)
+    _plan_futures[key] = future
+    future.add_done_callback(lambda f: _on_plan_done(key, f))
+    return future
+
+
+def _schedule_plan(job_id, params, plan_future):
+    """
+    Second step of a plan job: schedule the AI plan once it is ready.
+    """
+    try:
+        ai_plan = plan_future.result()
+        if "error" in ai_plan:
+            future = plan_future
+        else:
+            future = _get_executor().submit(run_schedule_job, ai_plan, params)
+            with _lock:
+                _futures[job_id] = future
+    except Exception as e:
+        future = Future()
+        future.set_exception(e)
+    future.add_done_callback(lambda f: _on_done(job_id, f))
+
+
+def submit_plan_job(subject, topics, hours_per_day, deadline_days, start_date, backend=None):
+    """
+    Queue "generate plan for subject" in the background.
+
+    The AI plan step depends only on the backend, subject and topics: requests that share
+    them share one backend call while it runs and reuse its cached plan afterwards, even
+    when their hours, deadline or start date differ.
+
+    Returns:
+        str: Job ID to poll with get_job().
+    """
+    from planner.ai_planner import backend_name
+
+    params = {
+        "subject": subject,
+        "topics": list(topics),
+        "hours_per_day": hours_per_day,
+        "deadline_days": deadline_days,
+        "start_date": str(start_date),
+        "backend": backend_name(backend),
+    }
+    job_id = job_id_for("plan", params)
+    with _lock:
+        if job_id in _futures:
+            return job_id
+        _start_job(job_id, "plan", params)
+        plan_future = _ai_plan_future(subject, params["topics"], params["backend"])
+        _futures[job_id] = plan_future
+    plan_future.add_done_callback(lambda f: _schedule_plan(job_id, params, f))
+    return job_id
+
+
+def get_job(job_id):
+    """
+    Poll a job.
+
+    Returns:
+        dict: Persisted job record with a "status" of running, done or failed, or None.
+        A job left "running" by a previous app process is reported as failed.
+    """
+    job = _load_job(job_id)
+    if job and job["status"] == "running" and job_id not in _futures:
+        job["status"] = "failed"
+        job["error"] = "Job was interrupted. Please submit it again."
+        _save_job(job)
+    return job
+
+
+def finished_jobs(kind):
+    """
+    Finished jobs of a kind whose result has not been applied yet, including jobs that
+    were submitted in an earlier session or completed after it ended. Only the pending
+    markers are listed, so the cost does not grow with the number of old or failed jobs.
+
+    Returns:
+        list: Persisted job records with status "done".
+    """
+    try:
+        job_ids = os.listdir(os.path.join(JOBS_DIR, "pending"))
+    except FileNotFoundError:
+        return []
+    jobs = []
+    for job_id in job_ids:
+        job = _load_job(job_id)
+        if job and job.get("kind") == kind and job["status"] == "done":
+            jobs.append(job)
+    return sorted(jobs, key=lambda job: job.get("finished_at", ""))
+
+
+def mark_applied(job_id):
+    """
+    Claim a finished job's result for writing into the app data by removing its pending
+    marker. Removal is atomic, so among concurrent reruns exactly one gets True; claim
+    before applying.
+
+    Returns:
+        bool: True if this caller claimed the job, False if it was already claimed.
+    """
+    try:
+        os.remove(_pending_path(job_id))
+    except FileNotFoundError:
+        return False
+    return True
@@ -0,0 +1,341 @@
+# planner/journal.py
+
+import copy
+import itertools
+import json
+import os
+import threading
+
+# Directory where change logs and snapshots are kept
+JOURNAL_DIR = "data/journal"
+SNAPSHOT_EVERY = 50
+MAX_HISTORY = 100
+
+# Document versions are unique across journals, so a cache keyed by one never matches a stale state
+_versions = itertools.count(1)
+
+
+# ---------- Operations ----------
+def insert_op(path, value, index=None):
+    """
+    Insert value into the list at path (appended when index is None).
+    """
+    return {"op": "insert", "path": path, "key": index, "value": value}
+
+
+def delete_op(path, key):
+    """
+    Remove a list index or dict key from the container at path.
+    """
+    return {"op": "delete", "path": path, "key": key}
+
+
+def set_op(path, key, value):
+    """
+    Set a list index or dict key of the container at path.
+    """
+    return {"op": "set", "path": path, "key": key, "value": value}
+
+
+def _container(state, path):
+    container = state
+    for key in path:
+        container = container[key]
+    return container
+
+
+def _apply_op(state, op):
+    """
+    Apply one operation to the state and return it with the details needed to invert it.
+    A batch whose sub-operation fails is rolled back before the error is raised.
+    """
+    if op["op"] == "batch":
+        applied = []
+        try:
+            for sub_op in op["ops"]:
+                applied.append(_apply_op(state, sub_op))
+        except Exception:
+            for sub_op in reversed(applied):
+                _apply_op(state, _inverse(sub_op))
+            raise
+        return dict(op, ops=applied)
+
+    container = _container(state, op["path"])
+    key = op.get("key")
+    if op["op"] == "insert":
+        key = len(container) if key is None else key
+        container.insert(key, op["value"])
+        return dict(op, key=key)
+    if op["op"] == "delete":
+        old = container.pop(key)
+        return dict(op, old=old)
+    if op["op"] == "set":
+        had = key in container if isinstance(container, dict) else True
+        old = container[key] if had else None
+        container[key] = op["value"]
+        return dict(op, had=had, old=old)
+    raise ValueError(f"Unknown journal operation '{op['op']}'")
+
+
+def _inverse(op):
+    if op["op"] == "batch":
+        return dict(op, ops=[_inverse(sub_op) for sub_op in reversed(op["ops"])])
+    if op["op"] == "insert":
+        return {"op": "delete", "path": op["path"], "key": op["key"]}
+    if op["op"] == "delete":
+        return {"op": "insert", "path": op["path"], "key": op["key"], "value": op["old"]}
+    if op["had"]:
+        return {"op": "set", "path": op["path"], "key": op["key"], "value": op["old"]}
+    return {"op": "delete", "path": op["path"], "key": op["key"]}
+
+
+def _documents_of(op):
+    if op["op"] == "batch":
+        return {doc for sub_op in op["ops"] for doc in _documents_of(sub_op)}
+    return {op["path"][0]}
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Journal:
+    """
+    Change journal with undo/redo over the app's data documents.
+
+    Every mutation is an operation appended to a write-ahead log before the data file is
+    saved; undo and redo apply the stored inverse/forward operation, so each step costs
+    O(1) regardless of history length. Every snapshot_every operations the full state is
+    snapshotted and the log starts over, so recovery after a crash loads the snapshot and
+    replays only the log tail. A data file changed outside the journal is reloaded and
+    the undo history is reset, since its inverse operations no longer apply.
+
+    Parameters:
+        name (str): Journal name (file prefix in journal_dir).
+        documents (dict): Document name -> (file path, load function, save function).
+    """
+
+    def __init__(self, name, documents, journal_dir=JOURNAL_DIR, snapshot_every=SNAPSHOT_EVERY,
+                 max_history=MAX_HISTORY):
+        self.documents = documents
+        self.snapshot_every = snapshot_every
+        self.max_history = max_history
+        os.makedirs(journal_dir, exist_ok=True)
+        self.log_path = os.path.join(journal_dir, f"{name}.log")
+        self.snapshot_path = os.path.join(journal_dir, f"{name}.snapshot.json")
+        self.files_path = os.path.join(journal_dir, f"{name}.files.json")
+        self._lock = threading.RLock()
+        self._recover()
+        self.versions = {doc: next(_versions) for doc in documents}
+
+    # ---------- Recovery ----------
+    def _recover(self):
+        snapshot = self._read_json(self.snapshot_path, {})
+        self.seq = snapshot.get("seq", 0)
+        self.state = snapshot.get("state", {})
+        self.undo_stack = snapshot.get("undo", [])
+        self.redo_stack = snapshot.get("redo", [])
+        self.pending = 0  # log entries since the snapshot
+        last_change = {}
+
+        # Replay the log tail written after the snapshot
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn last write
+                    if entry["seq"] <= self.seq:
+                        continue
+                    self._replay(entry)
+                    for doc in _documents_of(entry["op"]):
+                        last_change[doc] = entry["seq"]
+
+        saved = self._read_json(self.files_path, {})
+        self.signatures = {}
+        reset = False
+        for doc, (path, load, save) in self.documents.items():
+            record = saved.get(doc)
+            if doc in self.state and last_change.get(doc, 0) > (record["seq"] if record else 0):
+                # The log is newer than the last finished save: the crash interrupted the save,
+                # which may have left the file torn, so write the replayed state again
+                save(self.state[doc])
+                self.signatures[doc] = [_file_signature(path), self.seq]
+            elif doc in self.state and record and record["signature"] == _file_signature(path):
+                # Our own file, unchanged since the last save
+                self.signatures[doc] = [record["signature"], record["seq"]]
+            else:
+                # First run, or the file was changed outside the journal
+                self.state[doc] = load()
+                self.signatures[doc] = [_file_signature(path), self.seq]
+                reset = reset or doc in saved
+        if reset:
+            self.undo_stack, self.redo_stack = [], []
+        self._write_files()
+        if reset or not os.path.exists(self.snapshot_path):
+            self.snapshot()
+
+    def _replay(self, entry):
+        self.seq = entry["seq"]
+        self.pending += 1
+        _apply_op(self.state, entry["op"])
+        if entry["kind"] == "do":
+            self.undo_stack.append(entry["record"])
+            self.redo_stack = []
+        elif entry["kind"] == "undo":
+            self.redo_stack.append(self.undo_stack.pop())
+        else:
+            self.undo_stack.append(self.redo_stack.pop())
+        del self.undo_stack[:-self.max_history]
+
+    def refresh(self, documents=None):
+        """
+        Pick up data files changed outside the journal (cheap: one stat per document).
+
+        Parameters:
+            documents (iterable): Names of the documents to check; defaults to all.
+        """
+        with self._lock:
+            changed = False
+            for doc in documents or self.documents:
+                path, load, save = self.documents[doc]
+                if _file_signature(path) != self.signatures[doc][0]:
+                    self.state[doc] = load()
+                    self.signatures[doc] = [_file_signature(path), self.seq]
+                    self.versions[doc] = next(_versions)
+                    changed = True
+            if changed:
+                self.undo_stack, self.redo_stack = [], []
+                self._write_files()
+                self.snapshot()
+
+    # ---------- Mutations ----------
+    def insert(self, path, value, index=None, label=""):
+        return self.apply(insert_op(path, value, index), label)
+
+    def delete(self, path, key, label=""):
+        return self.apply(delete_op(path, key), label)
+
+    def set(self, path, key, value, label=""):
+        return self.apply(set_op(path, key, value), label)
+
+    def batch(self, ops, label=""):
+        """
+        Apply several operations as one undo step.
+        """
+        if ops:
+            return self.apply({"op": "batch", "ops": ops}, label)
+
+    def apply(self, op, label=""):
+        """
+        Apply, log and save one operation.
+
+        Returns:
+            The removed value for a delete, otherwise None.
+        """
+        with self._lock:
+            recorded = _apply_op(self.state, copy.deepcopy(op))
+            # The history keeps its own copies: later changes mutate the live values in place
+            record = {"op": copy.deepcopy(recorded), "label": label}
+            self._log("do", recorded, record)
+            self.undo_stack.append(record)
+            del self.undo_stack[:-self.max_history]
+            self.redo_stack = []
+            self._save(recorded)
+        return recorded.get("old") if recorded["op"] == "delete" else None
+
+    def undo(self):
+        """
+        Revert the last change. Returns its label, or None if there is nothing to undo.
+        """
+        with self._lock:
+            if not self.undo_stack:
+                return None
+            record = self.undo_stack.pop()
+            op = _inverse(copy.deepcopy(record["op"]))
+            _apply_op(self.state, op)
+            self._log("undo", op)
+            self.redo_stack.append(record)
+            self._save(op)
+        return record["label"] or "change"
+
+    def redo(self):
+        """
+        Re-apply the last undone change. Returns its label, or None if there is nothing to redo.
+        """
+        with self._lock:
+            if not self.redo_stack:
+                return None
+            record = self.redo_stack.pop()
+            op = _apply_op(self.state, copy.deepcopy(record["op"]))
+            self._log("redo", op)
+            self.undo_stack.append(record)
+            self._save(op)
+        return record["label"] or "change"
+
+    def version(self, doc):
+        """
+        Token that changes whenever the document's state changes (mutation, undo, redo or
+        reload), so derived data such as a search index can skip unchanged documents.
+        """
+        return self.versions[doc]
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    # ---------- Persistence ----------
+    def _log(self, kind, op, record=None):
+        self.seq += 1
+        entry = {"seq": self.seq, "kind": kind, "op": op}
+        if record is not None:
+            entry["record"] = record
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += 1
+
+    def _save(self, op):
+        for doc in _documents_of(op):
+            path, load, save = self.documents[doc]
+            save(self.state[doc])
+            self.signatures[doc] = [_file_signature(path), self.seq]
+            self.versions[doc] = next(_versions)
+        self._write_files()
+        if self.pending >= self.snapshot_every:
+            self.snapshot()
+
+    def _write_files(self):
+        files = {doc: {"signature": signature, "seq": seq} for doc, (signature, seq) in self.signatures.items()}
+        self._write_json(self.files_path, files)
+
+    def snapshot(self):
+        """
+        Save the full state and history, then start an empty log.
+        """
+        self._write_json(self.snapshot_path, {
+            "seq": self.seq, "state": self.state, "undo": self.undo_stack, "redo": self.redo_stack})
+        open(self.log_path, "w").close()
+        self.pending = 0
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(path + ".tmp", path)
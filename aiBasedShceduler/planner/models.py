@@ -0,0 +1,230 @@
+# planner/models.py
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+try:
+    import orjson  # optional, much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+# Maximum score per mock test kind (JEE Mains 300, IAT 240)
+MAX_SCORES = {"jee": 300, "iat": 240}
+
+
+# ---------- Parsing / validation helpers ----------
+def validate_mock_test(kind, score, accuracy):
+    """
+    Check a mock test result against the allowed ranges.
+
+    Returns:
+        str: Error message, or None if the values are valid.
+    """
+    max_score = MAX_SCORES[kind]
+    if not (0 <= score <= max_score):
+        return f"❌ Score must be between 0 and {max_score}."
+    if not (0 <= accuracy <= 100):
+        return "❌ Accuracy must be between 0 and 100."
+    return None
+
+
+def parse_date(value, field="date"):
+    """
+    Parse a YYYY-MM-DD string (or date/datetime) into a date. Raises ValueError.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"'{field}' is not a YYYY-MM-DD date: {value!r}")
+
+
+def parse_number(value, field):
+    """
+    Parse a number, keeping whole numbers as int. Raises ValueError.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{field}' is not a number: {value!r}")
+    return int(number) if number.is_integer() else number
+
+
+def _optional_date(value):
+    if value is None or value == "":
+        return None
+    return parse_date(value)
+
+
+# ---------- Records ----------
+# Records validate and normalize data where it enters the apps (forms, imports); the apps
+# keep storing the plain dicts returned by to_dict().
+@dataclass(slots=True)
+class Task:
+    """
+    A to-do item: main.py rows ({"Task", "Date", "Task Type"}) and strmApp todos ({"task", "done"}).
+    """
+    name: str
+    date: date = None
+    task_type: str = ""
+    done: bool = False
+
+    def __post_init__(self):
+        self.name = str(self.name).strip()
+        if not self.name:
+            raise ValueError("'task' is empty")
+        self.date = _optional_date(self.date)
+
+    @classmethod
+    def from_dict(cls, data):
+        if "Task" in data:
+            return cls(data["Task"], data.get("Date"), data.get("Task Type") or "")
+        return cls(data["task"], done=bool(data.get("done", False)))
+
+    def to_dict(self):
+        return {"task": self.name, "done": self.done}
+
+    def to_row(self):
+        return {"Task": self.name, "Date": self.date.isoformat() if self.date else "", "Task Type": self.task_type}
+
+
+@dataclass(slots=True)
+class ScheduleEntry:
+    """
+    A dated task in the strmApp schedule ({"date", "task"}).
+    """
+    date: date
+    task: str
+
+    def __post_init__(self):
+        self.date = parse_date(self.date)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["date"], data["task"])
+
+    def to_dict(self):
+        return {"date": self.date.isoformat(), "task": self.task}
+
+
+@dataclass(slots=True)
+class PlanEntry:
+    """
+    One study plan item; stored as {"subject", "topic", "duration"} under its date.
+    """
+    date: date
+    subject: str
+    topic: str
+    duration: float
+
+    def __post_init__(self):
+        self.date = parse_date(self.date)
+        self.subject = str(self.subject or "").strip()
+        self.topic = str(self.topic or "").strip()
+        if not self.topic:
+            raise ValueError("'topic' is empty")
+        self.duration = parse_number(self.duration, "duration")
+        if self.duration < 0:
+            raise ValueError("'duration' must be at least 0")
+
+    @classmethod
+    def from_dict(cls, data, plan_date=None):
+        return cls(plan_date if plan_date is not None else data.get("date"),
+                   data.get("subject"), data.get("topic"), data.get("duration"))
+
+    def to_dict(self):
+        return {"subject": self.subject, "topic": self.topic, "duration": self.duration}
+
+
+@dataclass(slots=True)
+class MockTest:
+    """
+    A JEE/IAT mock test result ({"score", "accuracy", "date", "time_taken"}).
+    kind selects the score range and is not stored.
+    """
+    score: float
+    accuracy: float
+    date: date
+    time_taken: float = 0
+    kind: str = "jee"
+
+    def __post_init__(self):
+        self.score = parse_number(self.score, "score")
+        self.accuracy = parse_number(self.accuracy, "accuracy")
+        error = validate_mock_test(self.kind, self.score, self.accuracy)
+        if error:
+            raise ValueError(error.lstrip("❌ "))
+        self.date = parse_date(self.date)
+        self.time_taken = parse_number(self.time_taken or 0, "time_taken")
+        if self.time_taken < 0:
+            raise ValueError("'time_taken' must be at least 0")
+
+    @classmethod
+    def from_dict(cls, data, kind="jee"):
+        return cls(data.get("score"), data.get("accuracy"), data.get("date"), data.get("time_taken"), kind)
+
+    def to_dict(self):
+        return {"score": self.score, "accuracy": self.accuracy, "date": self.date.isoformat(), "time_taken": self.time_taken}
+
+
+@dataclass(slots=True)
+class Mark:
+    """
+    A logged test score, one row of data/marks.csv.
+    """
+    date: date
+    subject: str
+    test_type: str
+    score: float
+    total: float
+    notes: str = ""
+
+    def __post_init__(self):
+        self.date = parse_date(self.date, "Date")
+        self.subject = str(self.subject or "").strip()
+        if not self.subject:
+            raise ValueError("'Subject' is empty")
+        self.test_type = str(self.test_type or "Others").strip()
+        self.score = parse_number(self.score, "Score")
+        self.total = parse_number(self.total, "Total")
+        if self.score < 0 or self.total < 1:
+            raise ValueError("Score must be at least 0 and Total at least 1")
+        self.notes = self.notes or ""
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("Date"), data.get("Subject"), data.get("Test Type"),
+                   data.get("Score"), data.get("Total"), data.get("Notes"))
+
+    def to_dict(self):
+        return {"Date": self.date.isoformat(), "Subject": self.subject, "Test Type": self.test_type,
+                "Score": self.score, "Total": self.total, "Notes": self.notes}
+
+
+# ---------- Serialization ----------
+def _encode_default(obj):
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, indent=False):
+    """
+    Encode records and plain data to JSON bytes, using orjson when installed.
+    Records are written with the same keys the apps store on disk.
+    """
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_encode_default, option=option)
+    return json.dumps(obj, default=_encode_default, indent=2 if indent else None,
+                      ensure_ascii=False).encode("utf-8")
+
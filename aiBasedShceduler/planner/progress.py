@@ -0,0 +1,150 @@
+# planner/progress.py
+
+from datetime import datetime
+
+STATUSES = ["completed", "in-progress", "not-started"]
+DEFAULT_SUBJECT = "General"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Allowed status changes per current status (None: topic not seen yet)
+TRANSITIONS = {
+    None: {"not-started", "in-progress", "completed"},
+    "not-started": {"in-progress", "completed"},
+    "in-progress": {"completed", "not-started"},
+    "completed": {"in-progress"},
+}
+
+
+def _empty_state():
+    return {"topics": {}, "subjects": {}}
+
+
+def ensure_state(data):
+    """
+    Make sure data has the materialized progress state next to the "study_progress" event log.
+    Data saved before the state existed is replayed once.
+
+    Returns:
+        dict: {"topics": {topic: latest state}, "subjects": {subject: {"topics", "completed"}}}
+    """
+    if "progress_state" not in data:
+        data["progress_state"] = _empty_state()
+        for event in data["study_progress"]:
+            _apply(data["progress_state"], event)
+    return data["progress_state"]
+
+
+def check_transition(data, topic, status):
+    """
+    Returns:
+        str: Error message if the topic cannot move to status, else None.
+    """
+    current = ensure_state(data)["topics"].get(topic)
+    current_status = current["status"] if current else None
+    if status == current_status:
+        return f"ℹ️ '{topic}' is already {status}."
+    if status not in TRANSITIONS[current_status]:
+        return f"❌ '{topic}' cannot go from {current_status} to {status}."
+    return None
+
+
+def state_slice(data, topic, events=()):
+    """
+    Copy of the part of the progress state that a change to topic reads and writes: its
+    entry and the counters of its current subject and of the subjects of the given events.
+    record_event and remove_event can run on this instead of the whole state.
+    """
+    state = ensure_state(data)
+    entry = state["topics"].get(topic)
+    subjects = {event.get("subject") or DEFAULT_SUBJECT for event in events if event["topic"] == topic}
+    if entry:
+        subjects.add(entry["subject"])
+    return {
+        "topics": {topic: dict(entry)} if entry else {},
+        "subjects": {subject: dict(state["subjects"][subject]) for subject in subjects if subject in state["subjects"]},
+    }
+
+
+def record_event(data, event):
+    """
+    Append a progress event to the log and update the materialized state in O(1).
+
+    Returns:
+        dict: {"topics": set, "subjects": set} of the state keys that changed.
+    """
+    data["study_progress"].append(event)
+    return _apply(ensure_state(data), event)
+
+
+def remove_event(data, index):
+    """
+    Remove one event from the log and replay only the events of its topic.
+
+    Returns:
+        tuple: (the removed event, {"topics": set, "subjects": set} of the state keys that changed).
+    """
+    removed = data["study_progress"].pop(index)
+    state = ensure_state(data)
+    topic = removed["topic"]
+    touched = {"topics": {topic}, "subjects": set()}
+    previous = state["topics"].pop(topic, None)
+    if previous:
+        touched["subjects"].add(previous["subject"])
+        counts = state["subjects"][previous["subject"]]
+        counts["topics"] -= 1
+        counts["completed"] -= previous["status"] == "completed"
+        if counts["topics"] == 0:
+            del state["subjects"][previous["subject"]]
+    for event in data["study_progress"]:
+        if event["topic"] == topic:
+            touched["subjects"] |= _apply(state, event)["subjects"]
+    return removed, touched
+
+
+def _apply(state, event):
+    topic, status, timestamp = event["topic"], event["status"], event["timestamp"]
+    entry = state["topics"].get(topic)
+    if entry is None:
+        entry = state["topics"][topic] = {
+            "subject": event.get("subject") or DEFAULT_SUBJECT,
+            "status": None,
+            "updated": timestamp,
+            "started": None,
+            "hours_spent": 0.0,
+        }
+        counts = state["subjects"].setdefault(entry["subject"], {"topics": 0, "completed": 0})
+        counts["topics"] += 1
+    counts = state["subjects"][entry["subject"]]
+
+    if status == "completed" and entry["status"] != "completed":
+        counts["completed"] += 1
+    elif status != "completed" and entry["status"] == "completed":
+        counts["completed"] -= 1
+
+    # Time between starting a topic and completing it
+    if status == "in-progress":
+        entry["started"] = timestamp
+    elif status == "completed" and entry["started"]:
+        spent = datetime.strptime(timestamp, TIMESTAMP_FORMAT) - datetime.strptime(entry["started"], TIMESTAMP_FORMAT)
+        entry["hours_spent"] = round(entry["hours_spent"] + spent.total_seconds() / 3600, 2)
+        entry["started"] = None
+    else:
+        entry["started"] = None
+
+    entry["status"] = status
+    entry["updated"] = timestamp
+    return {"topics": {topic}, "subjects": {entry["subject"]}}
+
+
+def subject_completion(data):
+    """
+    Completion percentage per subject, from the maintained counters.
+
+    Returns:
+        dict: Subject -> percentage of its topics that are completed.
+    """
+    return {
+        subject: round(100 * counts["completed"] / counts["topics"], 1)
+        for subject, counts in ensure_state(data)["subjects"].items()
+        if counts["topics"]
+    }
@@ -0,0 +1,132 @@
+# planner/quotes.py
+
+import csv
+import hashlib
+import mmap
+import os
+import random
+import struct
+from array import array
+from datetime import date
+
+# Quote corpus shipped with the apps: one "Author","Quote" row per line
+QUOTES_FILE = "qts.txt"
+
+# Index file header: source size, source mtime (ns); followed by one int64 offset per quote
+_HEADER = struct.Struct("<qq")
+_FLUSH_EVERY = 65536
+
+
+class QuoteIndex:
+    """
+    Random access to a quote corpus through a line-offset index.
+
+    The offsets are built in one streaming pass, saved next to the corpus (<path>.idx)
+    and memory-mapped together with the corpus, so serving a quote reads one line and
+    memory use does not grow with the number of quotes. The index is rebuilt when the
+    corpus changes.
+
+    Parameters:
+        path (str): Quote file ("Author","Quote" rows, optional header line).
+        index_path (str): Where to keep the offset index. Defaults to path + ".idx".
+    """
+
+    def __init__(self, path=QUOTES_FILE, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._authors = None
+        self._data = _map(path)
+        self._index = self._load_index()
+        self._offsets = memoryview(self._index)[_HEADER.size:].cast("q") if self._index else []
+
+    def _load_index(self):
+        stat = os.stat(self.path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        index = _map(self.index_path) if os.path.exists(self.index_path) else None
+        if index is not None and len(index) >= _HEADER.size and _HEADER.unpack_from(index) == signature:
+            return index
+        self._build_index(signature)
+        return _map(self.index_path)
+
+    def _build_index(self, signature):
+        tmp_path = self.index_path + ".tmp"
+        data = self._data
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(*signature))
+            offsets = array("q")
+            pos, size = 0, len(data)
+            while pos < size:
+                end = data.find(b"\n", pos)
+                end = size if end == -1 else end + 1
+                # Keep only quoted rows; skips the header and blank or broken lines
+                if data[pos:pos + 1] == b'"' and data[pos:pos + 8] != b'"Author"':
+                    offsets.append(pos)
+                    if len(offsets) >= _FLUSH_EVERY:
+                        offsets.tofile(f)
+                        offsets = array("q")
+                pos = end
+            offsets.tofile(f)
+        os.replace(tmp_path, self.index_path)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, number):
+        """
+        Return quote number (0-based) as {"author", "quote"}.
+        """
+        start = self._offsets[number]
+        end = self._data.find(b"\n", start)
+        line = self._data[start:end if end != -1 else len(self._data)].decode("utf-8").strip()
+        row = next(csv.reader([line]), ["", ""])
+        author, quote = (row + ["", ""])[:2]
+        return {"author": author, "quote": quote}
+
+    def quote_of_the_day(self, day=None, user=""):
+        """
+        Deterministic quote for a day (today by default) and user; None if there are no quotes.
+        """
+        if not len(self):
+            return None
+        day = day or date.today()
+        digest = hashlib.blake2b(f"{user}:{day.isoformat()}".encode("utf-8"), digest_size=8).digest()
+        return self.get(int.from_bytes(digest, "little") % len(self))
+
+    def random_quote(self, author=None):
+        """
+        Random quote, optionally by one author; None if there is no match.
+        """
+        numbers = self.author_index().get(author) if author else range(len(self))
+        if not numbers:
+            return None
+        return self.get(random.choice(numbers))
+
+    def author_index(self):
+        """
+        Author -> quote numbers, built once on first use.
+        """
+        if self._authors is None:
+            authors = {}
+            for number in range(len(self)):
+                authors.setdefault(self.get(number)["author"], array("I")).append(number)
+            self._authors = authors
+        return self._authors
+
+    def authors(self):
+        return sorted(self.author_index())
+
+    def by_author(self, author):
+        """
+        Every quote by one author.
+        """
+        return [self.get(number) for number in self.author_index().get(author, ())]
+
+
+def _map(path):
+    """
+    Memory-map a file read-only (empty files map to b"").
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,205 @@
+# planner/rolling_scheduler.py
+
+from planner.scheduler import _split_into_blocks, generate_schedule
+
+
+def _take_hours(remaining, capacity, slot_minutes):
+    """
+    Take up to capacity hours from the remaining plan, topic by topic in plan order.
+    A topic that only partly fits is cut at a whole slot.
+
+    Returns:
+        dict: Topic -> hours taken.
+    """
+    taken = {}
+    slot_hours = slot_minutes / 60
+    for topic, hours in remaining.items():
+        if capacity < slot_hours:
+            break
+        share = min(hours, int(round(capacity / slot_hours, 6)) * slot_hours)
+        if share > 0:
+            taken[topic] = share
+            capacity -= share
+    return taken
+
+
+def _take_window_load(remaining, days, hours_per_day, max_block_minutes, slot_minutes):
+    """
+    Pick the part of the remaining plan that fits into a window of days.
+    The blocks are cut to fill the days exactly and packed first-fit into the days in plan
+    order; packing stops at the first block that fits nowhere.
+
+    Returns:
+        dict: Topic -> hours taken.
+    """
+    daily_cap = int(round(hours_per_day * 60, 6)) // slot_minutes
+    max_block_slots = max(1, min(max_block_minutes // slot_minutes, daily_cap))
+    free = [daily_cap] * days
+    taken = {}
+    for topic, size in _split_into_blocks(remaining, max_block_slots, daily_cap, slot_minutes):
+        day = next((day for day, slots in enumerate(free) if slots >= size), None)
+        if day is None:
+            break
+        free[day] -= size
+        taken[topic] = min(remaining[topic], taken.get(topic, 0) + size * slot_minutes / 60)
+    return taken
+
+
+class RollingSchedule:
+    """
+    Rolling-horizon study schedule for long deadlines.
+
+    Only the next window_days are solved exactly with generate_schedule; the rest of the
+    plan is spread coarsely over buckets of bucket_days (7 for weeks, 30 for months).
+    Calling slide() moves the window forward and re-optimizes it for the hours that are
+    still left, so the solver never sees more than one window of days.
+
+    Parameters:
+        ai_plan (dict): Dictionary with topics and their estimated hours.
+        hours_per_day (float): Number of hours available for study per day.
+        deadline_days (int): Total days available to study.
+        window_days (int): Number of days solved in detail.
+        bucket_days (int): Size of the coarse buckets after the window.
+        **options: Extra keyword arguments for generate_schedule (slots, breaks, ...).
+            The output format options sparse and compact are not accepted.
+    """
+
+    def __init__(self, ai_plan, hours_per_day, deadline_days, window_days=14, bucket_days=7, **options):
+        fixed = sorted({"sparse", "compact"} & set(options))
+        if fixed:
+            raise TypeError(f"RollingSchedule does not accept {', '.join(fixed)}: windows are always sparse schedule dicts")
+        self.remaining = {topic: float(hours) for topic, hours in ai_plan.items() if float(hours) > 0}
+        self.hours_per_day = hours_per_day
+        self.deadline_days = deadline_days
+        self.window_days = window_days
+        self.bucket_days = bucket_days
+        self.options = options
+        self.day = 0  # days already behind the window
+        self._window = None
+
+    def window(self):
+        """
+        Solve (once per position) the detailed window.
+
+        Returns:
+            dict: Sparse schedule of the non-empty days in the window ("Day N" is absolute),
+            or {"error": ...} if no window load could be scheduled.
+        """
+        if self._window is None:
+            self._window = self._solve_window()
+        return self._window
+
+    def _solve_window(self):
+        days = min(self.window_days, self.deadline_days - self.day)
+        if days <= 0 or not self.remaining:
+            return {}
+
+        slot_minutes = self.options.get("slot_minutes", 15)
+        max_block_minutes = self.options.get("max_block_minutes", 90)
+        schedule = {"error": "No feasible schedule found. Please adjust your constraints."}
+        # A narrow study window can still keep the packed load from fitting; retry one day lighter
+        for load_days in range(days, 0, -1):
+            load = _take_window_load(self.remaining, load_days, self.hours_per_day, max_block_minutes, slot_minutes)
+            schedule = generate_schedule(load, self.hours_per_day, days, sparse=True, **self.options)
+            if "error" not in schedule:
+                break
+
+        if "error" in schedule:
+            return schedule
+        return {f"Day {self.day + int(label.split()[1])}": entries for label, entries in schedule.items()}
+
+    def outlook(self):
+        """
+        Spread the hours left after the window over coarse buckets.
+
+        Returns:
+            dict: Sparse mapping "Days a-b" -> {topic: hours} of the non-empty buckets.
+        """
+        remaining = self._after_window()
+        outlook = {}
+        start = min(self.day + self.window_days, self.deadline_days)
+        while remaining and start < self.deadline_days:
+            end = min(start + self.bucket_days, self.deadline_days)
+            taken = _take_hours(remaining, self.hours_per_day * (end - start), self.options.get("slot_minutes", 15))
+            if not taken:
+                break
+            outlook[f"Days {start + 1}-{end}"] = taken
+            remaining = _subtract(remaining, taken)
+            start = end
+        return outlook
+
+    def unscheduled(self):
+        """
+        Hours that do not fit before the deadline at the current pace.
+
+        Returns:
+            dict: Topic -> hours.
+        """
+        remaining = self._after_window()
+        for hours in self.outlook().values():
+            remaining = _subtract(remaining, hours)
+        return remaining
+
+    def _after_window(self):
+        window = self.window()
+        if "error" in window:
+            return dict(self.remaining)
+        return _subtract(self.remaining, _hours_per_topic(window.values()))
+
+    def slide(self, days=1, completed=None):
+        """
+        Move the window forward and re-optimize it on the next call to window().
+
+        Parameters:
+            days (int): Number of days that have passed.
+            completed (dict): Topic -> hours actually studied in those days. Defaults to
+                what the window had planned for them.
+        """
+        if completed is None:
+            window = self.window()
+            if "error" in window:
+                completed = {}
+            else:
+                passed = [entries for label, entries in window.items() if int(label.split()[1]) <= self.day + days]
+                completed = _hours_per_topic(passed)
+        self.remaining = _subtract(self.remaining, completed)
+        self.day = min(self.day + days, self.deadline_days)
+        self._window = None
+
+    def __iter__(self):
+        """
+        Lazily yield ("Day N", entries) for every non-empty day up to the deadline,
+        solving one window at a time and assuming each window is followed as planned.
+        """
+        rolling = RollingSchedule(self.remaining, self.hours_per_day, self.deadline_days,
+                                  self.window_days, self.bucket_days, **self.options)
+        rolling.day = self.day
+        while rolling.remaining and rolling.day < self.deadline_days:
+            window = rolling.window()
+            if "error" in window:
+                return
+            yield from window.items()
+            rolling.slide(min(self.window_days, self.deadline_days - rolling.day))
+
+
+def _hours_per_topic(days):
+    """
+    Sum the scheduled hours per topic over lists of schedule entries.
+    """
+    totals = {}
+    for entries in days:
+        for entry in entries:
+            totals[entry["topic"]] = totals.get(entry["topic"], 0) + entry["hours"]
+    return totals
+
+
+def _subtract(remaining, done):
+    """
+    Remove done hours from a topic -> hours plan, dropping finished topics.
+    """
+    left = {}
+    for topic, hours in remaining.items():
+        hours = round(hours - done.get(topic, 0), 6)
+        if hours > 0:
+            left[topic] = hours
+    return left
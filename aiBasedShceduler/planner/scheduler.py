@@ -1,63 +1,401 @@
 # planner/scheduler.py
 
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
 from ortools.sat.python import cp_model
-import pandas as pd
-import random
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _clock_to_minutes(clock):
+    """
+    Convert an "HH:MM" string (or a plain hour number) into minutes after midnight.
+    """
+    if isinstance(clock, (int, float)):
+        return int(round(clock * 60))
+    hours, _, minutes = str(clock).partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def _minutes_to_clock(minutes):
+    """
+    Convert minutes after midnight into an "HH:MM" string.
+    """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _free_segments(day_start, day_end, forbidden_hours):
+    """
+    Return the (start, end) minute ranges of a day that are open for study,
+    i.e. the study window with every forbidden range cut out of it.
+    """
+    segments = [(_clock_to_minutes(day_start), _clock_to_minutes(day_end))]
+    for blocked_start, blocked_end in forbidden_hours or []:
+        low, high = _clock_to_minutes(blocked_start), _clock_to_minutes(blocked_end)
+        remaining = []
+        for start, end in segments:
+            if high <= start or low >= end:
+                remaining.append((start, end))
+                continue
+            if start < low:
+                remaining.append((start, low))
+            if high < end:
+                remaining.append((high, end))
+        segments = remaining
+    return [(start, end) for start, end in segments if end > start]
+
+
+def _snap_segments(day_start, day_end, forbidden_hours, slot_minutes):
+    """
+    Free ranges of the day in whole slots, snapped inwards.
+    """
+    segments = []
+    for start, end in _free_segments(day_start, day_end, forbidden_hours):
+        start, end = math.ceil(start / slot_minutes), end // slot_minutes
+        if end > start:
+            segments.append((start, end))
+    return segments
+
+
+def _split_into_blocks(ai_plan, max_block_slots, day_capacity, slot_minutes):
+    """
+    Split every topic's estimated hours into study blocks of at most max_block_slots slots.
+    Fractional hours are rounded up to whole slots.
+
+    The topics are poured into consecutive days of day_capacity slots in plan order and a
+    block is cut wherever a day fills up, so the blocks pack every day exactly instead of
+    leaving a remainder too short for another full-length block.
+
+    Returns:
+        list: (topic, duration in slots) tuples, in plan order.
+    """
+    blocks = []
+    free = day_capacity
+    for topic, hours in ai_plan.items():
+        slots = math.ceil(round(float(hours) * 60 / slot_minutes, 6))
+        while slots > 0:
+            size = min(slots, max_block_slots, free)
+            blocks.append((topic, size))
+            slots -= size
+            free = free - size or day_capacity
+    return blocks
+
+
+def check_feasibility(ai_plan, hours_per_day, deadline_days, slot_minutes=15,
+                      day_start="08:00", day_end="22:00", forbidden_hours=None, **_):
+    """
+    Fast analytic check, in one pass over the plan, for inputs that can never be scheduled.
+    It only compares totals, so passing it does not guarantee a schedule exists.
+
+    Parameters:
+        Same as generate_schedule (other keyword arguments are ignored).
+
+    Returns:
+        dict: {"error", "shortfall_hours", "overload_per_day"} if impossible, else None.
+    """
+    if deadline_days < 1:
+        return {"error": "The deadline must be at least one day away.", "shortfall_hours": None, "overload_per_day": None}
+
+    segments = _snap_segments(day_start, day_end, forbidden_hours, slot_minutes)
+    window_slots = sum(end - start for start, end in segments)
+    daily_cap = int(round(hours_per_day * 60, 6)) // slot_minutes
+    if not window_slots or not daily_cap:
+        return {"error": "There is no study time in a day. Check hours per day, the study window and forbidden hours.",
+                "shortfall_hours": None, "overload_per_day": None}
+
+    needed_slots = sum(math.ceil(round(float(hours) * 60 / slot_minutes, 6)) for hours in ai_plan.values())
+    day_capacity = min(daily_cap, window_slots)
+    shortfall = needed_slots - day_capacity * deadline_days
+    if shortfall <= 0:
+        return None
+
+    slot_hours = slot_minutes / 60
+    needed_hours = needed_slots * slot_hours
+    available_hours = day_capacity * deadline_days * slot_hours
+    overload = round(needed_hours / deadline_days - day_capacity * slot_hours, 2)
+    return {
+        "error": (f"The plan needs {needed_hours:g} hours but only {available_hours:g} hours fit in "
+                  f"{deadline_days} days ({day_capacity * slot_hours:g} h/day). Short by {shortfall * slot_hours:g} hours: "
+                  f"study {overload:g} more hours per day or extend the deadline to "
+                  f"{math.ceil(needed_slots / day_capacity)} days."),
+        "shortfall_hours": shortfall * slot_hours,
+        "overload_per_day": overload,
+    }
+
+
+def _explain_infeasibility(blocks, segments, daily_cap, break_slots, day_slots, deadline_days, time_limit_seconds):
+    """
+    Re-solve the model with every user constraint guarded by an assumption literal and
+    return the names of a minimal set of constraints that together cannot be satisfied.
+    """
+    model = cp_model.CpModel()
+    names = {
+        "deadline": model.NewBoolVar("deadline"),
+        "hours per day": model.NewBoolVar("hours per day"),
+        "breaks between blocks": model.NewBoolVar("breaks between blocks"),
+        "study window and forbidden hours": model.NewBoolVar("study window and forbidden hours"),
+    }
+    # Without the deadline every block could take its own day
+    horizon_days = deadline_days + len(blocks)
+
+    timeline_intervals, load_intervals = [], []
+    for i, (topic, size) in enumerate(blocks):
+        fitting = [[start, end - size] for start, end in segments if end - start >= size]
+        day = model.NewIntVar(0, horizon_days - 1, f"day_{i}")
+        model.Add(day <= deadline_days - 1).OnlyEnforceIf(names["deadline"])
+        offset = model.NewIntVar(0, day_slots - size, f"offset_{i}")
+        model.AddLinearExpressionInDomain(offset, cp_model.Domain.FromIntervals(fitting)).OnlyEnforceIf(
+            names["study window and forbidden hours"])
+        start = model.NewIntVar(0, horizon_days * day_slots, f"start_{i}")
+        model.Add(start == day * day_slots + offset)
+        timeline_intervals.append(model.NewFixedSizeIntervalVar(start, size, f"block_{i}"))
+        if break_slots:
+            timeline_intervals.append(model.NewOptionalFixedSizeIntervalVar(
+                start + size, break_slots, names["breaks between blocks"], f"break_{i}"))
+
+        load_offset = model.NewIntVar(0, max(daily_cap - size, 0), f"load_offset_{i}")
+        load_start = model.NewIntVar(0, horizon_days * daily_cap, f"load_start_{i}")
+        model.Add(load_start == day * daily_cap + load_offset)
+        load_intervals.append(model.NewOptionalFixedSizeIntervalVar(load_start, size, names["hours per day"], f"load_{i}"))
+
+    model.AddNoOverlap(timeline_intervals)
+    model.AddNoOverlap(load_intervals)
+    model.AddAssumptions(list(names.values()))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit_seconds
+    solver.parameters.num_workers = 1
+    if solver.Solve(model) != cp_model.INFEASIBLE:
+        return []
+    core = set(solver.SufficientAssumptionsForInfeasibility())
+    conflicts = [name for name, literal in names.items() if literal.Index() in core]
+
+    # The solver's core need not be minimal: drop every constraint that is not needed for it
+    # (a check that runs out of time keeps the constraint)
+    solver.parameters.max_time_in_seconds = min(time_limit_seconds, 2)
+    for name in list(conflicts):
+        model.ClearAssumptions()
+        model.AddAssumptions([names[other] for other in conflicts if other != name])
+        if solver.Solve(model) == cp_model.INFEASIBLE:
+            conflicts.remove(name)
+    return conflicts
+
+
+class CompactSchedule:
+    """
+    Column-oriented schedule: one row per study block in typed arrays, with topic names
+    interned in a table and referenced by id. Rows are ordered by day and start time, so
+    a day's blocks are found by binary search and per-topic totals or per-day load are
+    plain array scans, without building entry dicts or repeating topic strings.
+    """
+    __slots__ = ("deadline_days", "topics", "_topic_ids", "days", "topic_ids", "starts", "minutes")
+
+    def __init__(self, deadline_days=0):
+        self.deadline_days = deadline_days
+        self.topics = []       # topic id -> name
+        self._topic_ids = {}   # name -> topic id
+        self.days = array("i")       # 1-based day of each block
+        self.topic_ids = array("i")
+        self.starts = array("H")     # minutes after midnight
+        self.minutes = array("H")    # block length
+
+    def topic_id(self, topic):
+        topic_id = self._topic_ids.get(topic)
+        if topic_id is None:
+            topic_id = self._topic_ids[topic] = len(self.topics)
+            self.topics.append(topic)
+        return topic_id
+
+    @classmethod
+    def from_blocks(cls, blocks, deadline_days=0):
+        """
+        Build from (day, start minute, topic, minutes) tuples in any order.
+        """
+        schedule = cls(deadline_days)
+        for day, start, topic, minutes in sorted(blocks, key=lambda block: (block[0], block[1])):
+            schedule.days.append(day)
+            schedule.topic_ids.append(schedule.topic_id(topic))
+            schedule.starts.append(start)
+            schedule.minutes.append(minutes)
+        schedule.deadline_days = max(deadline_days, schedule.days[-1] if schedule.days else 0)
+        return schedule
+
+    @classmethod
+    def from_dict(cls, schedule, deadline_days=0):
+        """
+        Compatibility adapter for the "Day N" -> [{"topic", "start", "end", "hours"}] format.
+        """
+        return cls.from_blocks(
+            ((int(label.split()[1]), _clock_to_minutes(entry["start"]), entry["topic"], round(entry["hours"] * 60))
+             for label, entries in schedule.items() if label != "error" for entry in entries),
+            max(deadline_days, len(schedule)))
+
+    def __len__(self):
+        return len(self.days)
+
+    def _rows(self, day):
+        return range(bisect_left(self.days, day), bisect_right(self.days, day))
+
+    def day(self, day):
+        """
+        Blocks of one day (1-based) as (topic, start minute, minutes) tuples.
+        """
+        return [(self.topics[self.topic_ids[row]], self.starts[row], self.minutes[row]) for row in self._rows(day)]
+
+    def topic_totals(self):
+        """
+        Hours per topic, in first-scheduled order.
+        """
+        totals = [0] * len(self.topics)
+        for topic_id, minutes in zip(self.topic_ids, self.minutes):
+            totals[topic_id] += minutes
+        return {topic: total / 60 for topic, total in zip(self.topics, totals)}
+
+    def day_load(self):
+        """
+        Hours studied per day, for the days that have blocks.
+        """
+        load = {}
+        for day, minutes in zip(self.days, self.minutes):
+            load[day] = load.get(day, 0) + minutes
+        return {day: total / 60 for day, total in load.items()}
+
+    def total_hours(self):
+        return sum(self.minutes) / 60
+
+    def to_dict(self, sparse=True):
+        """
+        The "Day N" -> [{"topic", "start", "end", "hours"}] format the apps use; with
+        sparse=False every day up to deadline_days is present.
+        """
+        schedule = {} if sparse else {f"Day {day}": [] for day in range(1, self.deadline_days + 1)}
+        for day, topic_id, start, minutes in zip(self.days, self.topic_ids, self.starts, self.minutes):
+            schedule.setdefault(f"Day {day}", []).append({
+                "topic": self.topics[topic_id],
+                "start": _minutes_to_clock(start),
+                "end": _minutes_to_clock(start + minutes),
+                "hours": minutes / 60,
+            })
+        return schedule
+
 
 # Function to generate the study schedule using OR-Tools
-def generate_schedule(ai_plan, hours_per_day, deadline_days):
+def generate_schedule(ai_plan, hours_per_day, deadline_days, slot_minutes=15,
+                      day_start="08:00", day_end="22:00", forbidden_hours=None,
+                      break_minutes=10, max_block_minutes=90, time_limit_seconds=10,
+                      sparse=False, num_workers=0, compact=False):
     """
     Generate an optimized study schedule using OR-Tools for the given AI plan.
 
+    Each topic is split into study blocks of at most max_block_minutes and every block
+    becomes one interval variable placed on a concrete time of day. Blocks never overlap,
+    are followed by a break, stay inside the study window and out of the forbidden hours,
+    and the study time of a day never exceeds hours_per_day. The model size grows with
+    the number of blocks, not with the number of minutes.
+
     Parameters:
-        ai_plan (dict): Dictionary with topics and their breakdown from AI planner.
-        hours_per_day (int): Number of hours available for study per day.
+        ai_plan (dict): Dictionary with topics and their estimated hours (fractions allowed).
+        hours_per_day (float): Number of hours available for study per day.
         deadline_days (int): Total days available to study.
+        slot_minutes (int): Time granularity; durations and start times snap to it.
+        day_start (str): Start of the daily study window ("HH:MM").
+        day_end (str): End of the daily study window ("HH:MM").
+        forbidden_hours (list): ("HH:MM", "HH:MM") ranges in which no study is placed.
+        break_minutes (int): Minimum rest after every study block.
+        max_block_minutes (int): Maximum length of one continuous study block.
+        time_limit_seconds (float): Solver time limit.
+        sparse (bool): Only include days that have study blocks.
+        num_workers (int): Solver search threads; 0 uses all cores. Use 1 when solving
+            many schedules in parallel processes.
+        compact (bool): Return a CompactSchedule instead of the dict format.
 
     Returns:
-        dict: Optimized study schedule (Day -> List of topics)
+        dict: Optimized study schedule (Day -> List of {"topic", "start", "end", "hours"}),
+        or {"error": ...} with the hour shortfall or the conflicting constraints.
     """
-    
-    # Flatten the AI plan into a list of topics and their estimated hours
-    tasks = []
-    for topic, hours in ai_plan.items():
-        for _ in range(hours):
-            tasks.append(topic)
-    
-    total_hours_needed = len(tasks)
-    
+    if slot_minutes <= 0 or MINUTES_PER_DAY % slot_minutes:
+        return {"error": "slot_minutes must evenly divide a day (e.g. 5, 15, 30 or 60)."}
+
+    # Reject impossible inputs before building the model
+    problem = check_feasibility(ai_plan, hours_per_day, deadline_days, slot_minutes,
+                                day_start, day_end, forbidden_hours)
+    if problem:
+        return problem
+
+    day_slots = MINUTES_PER_DAY // slot_minutes
+    daily_cap = int(round(hours_per_day * 60, 6)) // slot_minutes
+    break_slots = math.ceil(break_minutes / slot_minutes)
+    segments = _snap_segments(day_start, day_end, forbidden_hours, slot_minutes)
+    window_slots = sum(end - start for start, end in segments)
+    longest_segment = max(end - start for start, end in segments)
+    max_block_slots = max(1, min(max_block_minutes // slot_minutes, daily_cap, longest_segment))
+
+    blocks = _split_into_blocks(ai_plan, max_block_slots, min(daily_cap, window_slots), slot_minutes)
+
     # Create the model
     model = cp_model.CpModel()
 
-    # Create variables: for each task, we will assign it to a specific day
-    task_assignments = []
-    for i in range(total_hours_needed):
-        task_assignments.append(model.NewIntVar(0, deadline_days - 1, f"task_{i}"))
-    
-    # Add constraints: Ensure we don't exceed available study hours per day
-    for day in range(deadline_days):
-        model.Add(sum(task_assignments[i] == day for i in range(total_hours_needed)) <= hours_per_day)
-    
-    # Objective: Minimize the max day index (i.e., we want to spread tasks evenly)
-    model.Minimize(max(task_assignments))
-    
+    block_days, block_offsets, block_ends = [], [], []
+    timeline_intervals, load_intervals = [], []
+    previous_topic, previous_start = None, None
+    for i, (topic, size) in enumerate(blocks):
+        fitting = [[start, end - size] for start, end in segments if end - start >= size]
+
+        # Day and time of day of the block; start is its position on the global timeline
+        day = model.NewIntVar(0, deadline_days - 1, f"day_{i}")
+        offset = model.NewIntVarFromDomain(cp_model.Domain.FromIntervals(fitting), f"offset_{i}")
+        start = model.NewIntVar(0, deadline_days * day_slots, f"start_{i}")
+        model.Add(start == day * day_slots + offset)
+        timeline_intervals.append(
+            model.NewFixedSizeIntervalVar(start, size + break_slots, f"block_{i}"))
+
+        # The same block packed into a per-day segment of daily_cap slots bounds the daily load
+        if daily_cap < window_slots:
+            load_offset = model.NewIntVar(0, daily_cap - size, f"load_offset_{i}")
+            load_start = model.NewIntVar(0, deadline_days * daily_cap, f"load_start_{i}")
+            model.Add(load_start == day * daily_cap + load_offset)
+            load_intervals.append(model.NewFixedSizeIntervalVar(load_start, size, f"load_{i}"))
+
+        # Keep the blocks of one topic in order (also breaks symmetry between them)
+        if topic == previous_topic:
+            model.Add(previous_start < start)
+        previous_topic, previous_start = topic, start
+
+        block_days.append(day)
+        block_offsets.append(offset)
+        block_ends.append(start + size)
+
+    model.AddNoOverlap(timeline_intervals)
+    if load_intervals:
+        model.AddNoOverlap(load_intervals)
+
+    # Objective: finish as early as possible
+    if block_ends:
+        finish = model.NewIntVar(0, deadline_days * day_slots, "finish")
+        model.AddMaxEquality(finish, block_ends)
+        model.Minimize(finish)
+
     # Solve the model
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 10
+    solver.parameters.max_time_in_seconds = time_limit_seconds
+    solver.parameters.num_workers = num_workers
     status = solver.Solve(model)
 
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         # Generate the final schedule
-        schedule = {f"Day {day + 1}": [] for day in range(deadline_days)}
-        for i in range(total_hours_needed):
-            assigned_day = solver.Value(task_assignments[i])
-            schedule[f"Day {assigned_day + 1}"].append(tasks[i])
-
-        # Optionally randomize order of topics in each day to avoid monotony
-        for day in schedule:
-            random.shuffle(schedule[day])
-
-        return schedule
+        schedule = CompactSchedule.from_blocks(
+            ((solver.Value(block_days[i]) + 1, solver.Value(block_offsets[i]) * slot_minutes, topic, size * slot_minutes)
+             for i, (topic, size) in enumerate(blocks)),
+            deadline_days)
+        return schedule if compact else schedule.to_dict(sparse)
+    elif status == cp_model.INFEASIBLE:
+        conflicts = _explain_infeasibility(blocks, segments, daily_cap, break_slots, day_slots,
+                                           deadline_days, time_limit_seconds)
+        if conflicts:
+            return {"error": f"No feasible schedule found. These constraints conflict: {', '.join(conflicts)}.",
+                    "conflicts": conflicts}
+        return {"error": "No feasible schedule found. Please adjust your constraints."}
     else:
         return {"error": "No feasible schedule found. Please adjust your constraints."}
-
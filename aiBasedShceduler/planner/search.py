@@ -0,0 +1,191 @@
+# planner/search.py
+
+import hashlib
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from difflib import get_close_matches
+
+_TOKEN = re.compile(r"\w+")
+
+# Ranking weights for how a query term matched a document word
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.3
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def _variants(word):
+    """
+    The word and every word left after deleting one of its letters. Two words within one
+    edit (insertion, deletion, substitution or swap) share at least one variant.
+    """
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class SearchIndex:
+    """
+    Incrementally maintained inverted index with prefix and fuzzy matching.
+
+    Documents are added and removed one at a time; only their own words are touched.
+    The vocabulary is kept sorted so a prefix lookup is a binary search. Typos are looked
+    up in a deletion index (every word under itself and each one-letter deletion of it),
+    so finding words within one edit costs O(len(term)) lookups, not a vocabulary scan.
+    """
+
+    def __init__(self):
+        self._postings = {}   # word -> set of doc ids
+        self._vocabulary = []  # sorted words
+        self._deletions = {}  # word or one-letter deletion -> set of words
+        self._docs = {}       # doc id -> (words, fields)
+        self._sources = {}    # source -> set of doc ids
+        self._versions = {}   # source -> version of its last sync
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, text, **fields):
+        """
+        Index a document. fields (e.g. kind, date) are returned with search results.
+        """
+        if doc_id in self._docs:
+            self.remove(doc_id)
+        words = set(tokenize(text))
+        for word in words:
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = set()
+                insort(self._vocabulary, word)
+                for variant in _variants(word):
+                    self._deletions.setdefault(variant, set()).add(word)
+            postings.add(doc_id)
+        self._docs[doc_id] = (words, dict(fields, text=text))
+
+    def remove(self, doc_id):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for word in entry[0]:
+            postings = self._postings[word]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+                for variant in _variants(word):
+                    words = self._deletions[variant]
+                    words.discard(word)
+                    if not words:
+                        del self._deletions[variant]
+
+    def sync(self, source, documents, version=None):
+        """
+        Make the index match the current documents of one source (e.g. "todo").
+        Unchanged documents are skipped, so calling this on every rerun only indexes changes.
+
+        Parameters:
+            source (str): Name of the data source.
+            documents (iterable): (text, fields dict) pairs.
+            version: Version of the source data (e.g. Journal.version()). When it matches
+                the last sync, the documents are not even read.
+        """
+        if version is not None and self._versions.get(source) == version:
+            return
+        current, seen = {}, Counter()
+        for text, fields in documents:
+            key = repr((text, sorted(fields.items())))
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+            # Identical documents (e.g. two equal to-dos) each get their own id
+            seen[digest] += 1
+            current[f"{source}:{digest}:{seen[digest]}"] = (text, fields)
+
+        known = self._sources.get(source, set())
+        for doc_id in known - current.keys():
+            self.remove(doc_id)
+        for doc_id in current.keys() - known:
+            text, fields = current[doc_id]
+            self.add(doc_id, text, source=source, **fields)
+        self._sources[source] = set(current)
+        self._versions[source] = version
+
+    def _expand(self, term):
+        """
+        Words matching one query term, with their match weight.
+        """
+        matches = {}
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, term)
+        while position < len(vocabulary) and vocabulary[position].startswith(term):
+            word = vocabulary[position]
+            matches[word] = EXACT if word == term else PREFIX
+            position += 1
+        if not matches and len(term) > 2:
+            candidates = set()
+            for variant in _variants(term):
+                candidates |= self._deletions.get(variant, set())
+            for word in get_close_matches(term, candidates, n=5, cutoff=0.75):
+                matches[word] = FUZZY
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Find documents containing every query term (as a word, word prefix or close match).
+
+        Returns:
+            list: Result fields dicts with a "score", best first.
+        """
+        scores = None
+        for term in set(tokenize(query)):
+            term_scores = {}
+            for word, weight in self._expand(term).items():
+                for doc_id in self._postings[word]:
+                    if weight > term_scores.get(doc_id, 0):
+                        term_scores[doc_id] = weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+
+        ranked = sorted((scores or {}).items(), key=lambda item: -item[1])[:limit]
+        return [dict(self._docs[doc_id][1], score=score) for doc_id, score in ranked]
+
+
+# ---------- Documents from the app data ----------
+def task_documents(tasks):
+    """
+    To-do items: strmApp ({"task", "done"}) and main.py ({"Task", "Date", "Task Type"}).
+    """
+    for task in tasks:
+        if "Task" in task:
+            fields = {"kind": "Task", "date": str(task.get("Date") or ""), "task": task["Task"]}
+            yield f"{task['Task']} {task.get('Task Type') or ''}", fields
+        else:
+            yield task["task"], {"kind": "To-Do", "date": ""}
+
+
+def schedule_documents(schedule):
+    for item in schedule:
+        yield item["task"], {"kind": "Schedule", "date": item["date"]}
+
+
+def plan_documents(study_plan):
+    for plan_date, entries in study_plan.items():
+        for entry in entries:
+            yield f"{entry['subject']} {entry['topic']}", {"kind": "Plan", "date": plan_date}
+
+
+def mark_documents(marks):
+    """
+    Marks rows (dicts with Date, Subject, Test Type and Notes).
+    """
+    for mark in marks:
+        notes = mark.get("Notes")
+        notes = "" if notes is None or notes != notes else notes  # NaN from pandas
+        yield f"{mark['Subject']} {mark['Test Type']} {notes}", {"kind": "Test", "date": str(mark["Date"])[:10]}
+
+
+def progress_documents(study_progress):
+    for progress in study_progress:
+        yield progress["topic"], {"kind": f"Progress ({progress['status']})", "date": progress["timestamp"][:10]}
@@ -0,0 +1,142 @@
+# planner/services.py
+
+import json
+import os
+from datetime import date, timedelta
+
+from planner.bulk_io import MARKS_COLUMNS, MARKS_FILE, PLAN_FILE
+from planner.journal import Journal, insert_op, set_op
+from planner.models import Mark, PlanEntry, ScheduleEntry, Task, dumps
+
+# Data files of the study assistant app (relative to the app directory)
+DATA_DIR = "data"
+SCHEDULE_FILE = "data/schedule.json"
+TODO_FILE = "data/todo.json"
+
+
+# ---------- File helpers ----------
+def load_json(path, default):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return default
+
+
+def save_json(path, data):
+    # Write a temporary file and swap it in, so a crash never leaves a torn data file
+    with open(path + ".tmp", "wb") as f:
+        f.write(dumps(data, indent=True))
+    os.replace(path + ".tmp", path)
+
+
+def load_marks(path=MARKS_FILE):
+    import pandas as pd
+
+    return pd.read_csv(path).to_dict("records") if os.path.exists(path) else []
+
+
+def save_marks(records, path=MARKS_FILE):
+    import pandas as pd
+
+    pd.DataFrame(records, columns=MARKS_COLUMNS).to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+class StudyData:
+    """
+    Service layer shared by the study assistant pages.
+
+    Owns the schedule, study plan, to-do list and marks, and routes every change through
+    the journal so it can be undone. Pages read the documents from here and call
+    refresh() with only the documents they show, so a rerun stats just those files.
+    """
+
+    def __init__(self):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self.journal = Journal("strmApp", {
+            "schedule": (SCHEDULE_FILE, lambda: load_json(SCHEDULE_FILE, []), lambda data: save_json(SCHEDULE_FILE, data)),
+            "study_plan": (PLAN_FILE, lambda: load_json(PLAN_FILE, {}), lambda data: save_json(PLAN_FILE, data)),
+            "todo": (TODO_FILE, lambda: load_json(TODO_FILE, []), lambda data: save_json(TODO_FILE, data)),
+            "marks": (MARKS_FILE, load_marks, save_marks),
+        })
+
+    def refresh(self, *documents):
+        self.journal.refresh(documents or None)
+
+    @property
+    def schedule(self):
+        return self.journal.state["schedule"]
+
+    @property
+    def study_plan(self):
+        return self.journal.state["study_plan"]
+
+    @property
+    def todo_list(self):
+        return self.journal.state["todo"]
+
+    @property
+    def marks(self):
+        return self.journal.state["marks"]
+
+    def marks_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.marks, columns=MARKS_COLUMNS)
+
+    # ---------- Schedule ----------
+    def add_schedule_task(self, day, task):
+        self.journal.insert(["schedule"], ScheduleEntry(day, task).to_dict(), label=f"add task '{task}'")
+
+    def remove_schedule_task(self, index):
+        self.journal.delete(["schedule"], index, label=f"remove task '{self.schedule[index]['task']}'")
+
+    # ---------- Marks ----------
+    def log_score(self, test_date, subject, test_type, score, total, notes=""):
+        row = Mark(test_date, subject, test_type, score, total, notes).to_dict()
+        self.journal.insert(["marks"], row, label=f"log {subject} score")
+
+    def remove_score(self, index):
+        self.journal.delete(["marks"], index, label=f"remove {self.marks[index]['Subject']} test")
+
+    # ---------- Study plan ----------
+    def _plan_ops(self, plan_date, subject, topic, duration, ops, new_dates):
+        if plan_date not in self.study_plan and plan_date not in new_dates:
+            new_dates.add(plan_date)
+            ops.append(set_op(["study_plan"], plan_date, []))
+        ops.append(insert_op(["study_plan", plan_date], PlanEntry(plan_date, subject, topic, duration).to_dict()))
+        # Every plan entry also goes on the To-Do list
+        ops.append(insert_op(["todo"], Task(f"{subject} - {topic} ({duration} hrs)").to_dict()))
+
+    def add_plan_entry(self, plan_date, subject, topic, duration):
+        ops = []
+        self._plan_ops(str(plan_date), subject, topic, duration, ops, set())
+        self.journal.batch(ops, label=f"plan {subject} - {topic}")
+
+    def remove_plan_entry(self, plan_date, index):
+        topic = self.study_plan[plan_date][index]["topic"]
+        self.journal.delete(["study_plan", plan_date], index, label=f"remove plan {topic}")
+
+    def apply_plan_job(self, job):
+        """
+        Write a finished background plan job into the study plan and to-do list as one undo step.
+        """
+        start = date.fromisoformat(job["params"]["start_date"])
+        subject = job["params"]["subject"]
+        ops, new_dates = [], set()
+        for day, entries in job["result"]["schedule"].items():
+            plan_date = str(start + timedelta(days=int(day.split()[1]) - 1))
+            for entry in entries:
+                self._plan_ops(plan_date, subject, entry["topic"], entry["hours"], ops, new_dates)
+        self.journal.batch(ops, label=f"AI plan for {subject}")
+
+    # ---------- To-do ----------
+    def add_todo(self, task):
+        self.journal.insert(["todo"], Task(task).to_dict(), label=f"add to-do '{task}'")
+
+    def toggle_todo(self, index):
+        item = self.todo_list[index]
+        self.journal.set(["todo", index], "done", not item["done"], label=f"tick '{item['task']}'")
+
+    def remove_todo(self, index):
+        self.journal.delete(["todo"], index, label=f"remove to-do '{self.todo_list[index]['task']}'")
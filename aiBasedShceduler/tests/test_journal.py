@@ -0,0 +1,81 @@
+# tests/test_journal.py
+
+import json
+
+import pytest
+
+from planner.journal import Journal, delete_op, insert_op, set_op
+
+
+def _open(tmp_path, snapshot_every=50):
+    path = tmp_path / "todo.json"
+
+    def load():
+        return json.loads(path.read_text()) if path.exists() else []
+
+    def save(data):
+        path.write_text(json.dumps(data))
+
+    return Journal("test", {"todo": (str(path), load, save)}, journal_dir=str(tmp_path / "journal"),
+                   snapshot_every=snapshot_every)
+
+
+def test_undo_and_redo(tmp_path):
+    journal = _open(tmp_path)
+    journal.insert(["todo"], {"task": "a"}, label="add a")
+    journal.batch([insert_op(["todo"], {"task": "b"}), set_op(["todo", 0], "task", "A")], label="edit")
+
+    assert journal.undo() == "edit"
+    assert journal.state["todo"] == [{"task": "a"}]
+    assert journal.redo() == "edit"
+    assert journal.state["todo"] == [{"task": "A"}, {"task": "b"}]
+    assert json.loads((tmp_path / "todo.json").read_text()) == journal.state["todo"]
+
+
+def test_failed_batch_leaves_state_unchanged(tmp_path):
+    journal = _open(tmp_path)
+    journal.insert(["todo"], {"task": "a"})
+
+    with pytest.raises(IndexError):
+        journal.batch([insert_op(["todo"], {"task": "b"}), delete_op(["todo"], 5)])
+
+    assert journal.state["todo"] == [{"task": "a"}]
+    assert _open(tmp_path).state["todo"] == [{"task": "a"}]
+
+
+@pytest.mark.parametrize("snapshot_every", [50, 2])
+def test_recovery_replays_the_log_and_keeps_history(tmp_path, snapshot_every):
+    journal = _open(tmp_path, snapshot_every)
+    for task in "abc":
+        journal.insert(["todo"], {"task": task}, label=task)
+    journal.undo()
+
+    recovered = _open(tmp_path, snapshot_every)
+    assert recovered.state["todo"] == [{"task": "a"}, {"task": "b"}]
+    assert recovered.redo() == "c"
+    assert recovered.undo() == "c"
+    assert recovered.undo() == "b"
+
+
+def test_recovery_rewrites_a_torn_data_file(tmp_path):
+    journal = _open(tmp_path)
+    journal.insert(["todo"], {"task": "a"})
+    # Crash after logging the next change but in the middle of saving it
+    op = insert_op(["todo"], {"task": "b"}, 1)
+    journal._log("do", op, {"op": op, "label": "b"})
+    (tmp_path / "todo.json").write_text('[{"task": "a"}, {"ta')
+
+    recovered = _open(tmp_path)
+    assert recovered.state["todo"] == [{"task": "a"}, {"task": "b"}]
+    assert json.loads((tmp_path / "todo.json").read_text()) == recovered.state["todo"]
+    assert recovered.undo() == "b"
+
+
+def test_external_change_reloads_and_resets_history(tmp_path):
+    journal = _open(tmp_path)
+    journal.insert(["todo"], {"task": "a"})
+    (tmp_path / "todo.json").write_text(json.dumps([{"task": "edited elsewhere"}]))
+
+    journal.refresh()
+    assert journal.state["todo"] == [{"task": "edited elsewhere"}]
+    assert not journal.can_undo()
@@ -0,0 +1,25 @@
+# tests/test_scheduler.py
+
+from planner.rolling_scheduler import RollingSchedule
+from planner.scheduler import _split_into_blocks, generate_schedule
+
+
+def _hours_per_day(schedule):
+    return {day: sum(entry["hours"] for entry in entries) for day, entries in schedule.items()}
+
+
+def test_blocks_fill_every_day():
+    assert _split_into_blocks({"A": 4}, 6, 8, 15) == [("A", 6), ("A", 2), ("A", 6), ("A", 2)]
+
+
+def test_plan_that_exactly_fills_the_days_is_scheduled():
+    schedule = generate_schedule({"A": 4}, 2, 2)
+    assert _hours_per_day(schedule) == {"Day 1": 2, "Day 2": 2}
+
+    schedule = generate_schedule({"A": 6}, 2, 3)
+    assert _hours_per_day(schedule) == {"Day 1": 2, "Day 2": 2, "Day 3": 2}
+
+
+def test_rolling_window_uses_the_full_daily_limit():
+    window = RollingSchedule({f"Topic {i}": 30 for i in range(20)}, 2, 300).window()
+    assert set(_hours_per_day(window).values()) == {2}
@@ -0,0 +1,39 @@
+# tests/test_search.py
+
+from planner.search import SearchIndex, task_documents
+
+
+def test_prefix_and_typo_matches():
+    index = SearchIndex()
+    index.add("a", "Thermodynamics revision")
+    index.add("b", "Organic chemistry")
+
+    assert [result["text"] for result in index.search("thermo")] == ["Thermodynamics revision"]
+    assert [result["text"] for result in index.search("orgnic")] == ["Organic chemistry"]
+    assert [result["text"] for result in index.search("chemsitry")] == ["Organic chemistry"]
+
+    index.remove("b")
+    assert index.search("orgnic") == []
+
+
+def test_identical_documents_stay_separate():
+    index = SearchIndex()
+    todos = [{"task": "Revise optics", "done": False}, {"task": "Revise optics", "done": False}]
+    index.sync("todo", task_documents(todos))
+    assert len(index.search("optics")) == 2
+
+    index.sync("todo", task_documents(todos[:1]))
+    assert len(index.search("optics")) == 1
+
+
+def test_sync_skips_an_unchanged_version():
+    index = SearchIndex()
+    index.sync("todo", task_documents([{"task": "Revise optics"}]), version=1)
+
+    def unread():
+        raise AssertionError("documents were read")
+        yield
+
+    index.sync("todo", unread(), version=1)
+    index.sync("todo", task_documents([]), version=2)
+    assert index.search("optics") == []